@@ -0,0 +1,96 @@
+"""partition vacation by start_date
+
+Revision ID: 4d407702d3be
+Revises: 004281ddd903
+Create Date: 2026-10-19 12:10:41.204518
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d407702d3be'
+down_revision: Union[str, None] = '004281ddd903'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_vacation_receiver_id': ['receiver_id'],
+    'ix_vacation_giver_id': ['giver_id'],
+    'ix_vacation_start_date': ['start_date'],
+    'ix_vacation_end_date': ['end_date'],
+    'ix_vacation_dates': ['start_date', 'end_date'],
+}
+
+COLUMNS = 'id, giver_id, receiver_id, start_date, end_date, created_date, description'
+
+
+def vacation_columns(start_date_nullable: bool) -> list:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('vacation_id_seq')"), nullable=False),
+        sa.Column('giver_id', sa.Integer(), nullable=True),
+        sa.Column('receiver_id', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=start_date_nullable),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('created_date', sa.Date(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+    ]
+
+
+def move_old_table_aside(pkey: str) -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name='vacation')
+    op.drop_constraint('fk_vacation_giv_user', 'vacation', type_='foreignkey')
+    op.drop_constraint('fk_vacation_rev_user', 'vacation', type_='foreignkey')
+    op.rename_table('vacation', 'vacation_old')
+    op.execute(f'ALTER TABLE vacation_old RENAME CONSTRAINT {pkey} TO vacation_old_pkey')
+
+
+def finish_new_table() -> None:
+    op.execute(f'INSERT INTO vacation ({COLUMNS}) SELECT {COLUMNS} FROM vacation_old')
+    op.execute('ALTER SEQUENCE vacation_id_seq OWNED BY vacation.id')
+    op.drop_table('vacation_old')
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'vacation', columns, unique=False)
+    op.create_foreign_key('fk_vacation_giv_user', 'vacation', 'user', ['giver_id'], ['id'], ondelete='SET NULL', use_alter=True)
+    op.create_foreign_key('fk_vacation_rev_user', 'vacation', 'user', ['receiver_id'], ['id'], ondelete='CASCADE', use_alter=True)
+
+
+def upgrade() -> None:
+    op.execute('UPDATE vacation SET start_date = COALESCE(created_date, CURRENT_DATE) WHERE start_date IS NULL')
+    move_old_table_aside('vacation_pkey')
+
+    op.create_table(
+        'vacation',
+        *vacation_columns(start_date_nullable=False),
+        sa.PrimaryKeyConstraint('id', 'start_date', name='vacation_pkey'),
+        postgresql_partition_by='RANGE (start_date)',
+    )
+    op.execute('CREATE TABLE vacation_default PARTITION OF vacation DEFAULT')
+
+    first_year = op.get_bind().execute(
+        sa.text('SELECT EXTRACT(YEAR FROM MIN(start_date))::int FROM vacation_old')
+    ).scalar() or date.today().year
+    for year in range(first_year, date.today().year + 3):
+        op.execute(
+            f"CREATE TABLE vacation_y{year} PARTITION OF vacation "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+
+    finish_new_table()
+
+
+def downgrade() -> None:
+    move_old_table_aside('vacation_pkey')
+
+    op.create_table(
+        'vacation',
+        *vacation_columns(start_date_nullable=True),
+        sa.PrimaryKeyConstraint('id', name='vacation_pkey'),
+    )
+
+    finish_new_table()
@@ -0,0 +1,37 @@
+"""check vacation max days
+
+Revision ID: a91c5e3f7d08
+Revises: d84b1f0c37e2
+Create Date: 2026-10-20 10:14:52.381047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import VACATION_MAX_DAYS
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c5e3f7d08'
+down_revision: Union[str, None] = 'd84b1f0c37e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    too_long = op.get_bind().execute(
+        sa.text('SELECT id FROM vacation WHERE end_date - start_date > :days ORDER BY id'),
+        {'days': VACATION_MAX_DAYS},
+    ).scalars().all()
+    if too_long:
+        raise RuntimeError(
+            f'Vacations longer than VACATION_MAX_DAYS={VACATION_MAX_DAYS} would drop out '
+            f'of date range queries; shorten them or raise the limit: {too_long}'
+        )
+    op.create_check_constraint('ck_vacation_max_days', 'vacation', f'end_date - start_date <= {VACATION_MAX_DAYS}')
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_vacation_max_days', 'vacation', type_='check')
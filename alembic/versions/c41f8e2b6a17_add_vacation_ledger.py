@@ -0,0 +1,45 @@
+"""add vacation ledger
+
+Revision ID: c41f8e2b6a17
+Revises: b7e3c1a9d205
+Create Date: 2026-10-19 16:20:47.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8e2b6a17'
+down_revision: Union[str, None] = 'b7e3c1a9d205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'vacation_ledger',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('days_taken', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], name='fk_vacation_ledger_user', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'year'),
+    )
+    op.execute('''
+        INSERT INTO vacation_ledger (user_id, year, days_taken)
+        SELECT v.receiver_id, y.year,
+               SUM(LEAST(v.end_date, make_date(y.year, 12, 31))
+                   - GREATEST(v.start_date, make_date(y.year, 1, 1)) + 1)
+        FROM vacation v
+        CROSS JOIN LATERAL generate_series(
+            EXTRACT(YEAR FROM v.start_date)::int, EXTRACT(YEAR FROM v.end_date)::int
+        ) AS y(year)
+        WHERE v.end_date IS NOT NULL
+        GROUP BY v.receiver_id, y.year
+    ''')
+
+
+def downgrade() -> None:
+    op.drop_table('vacation_ledger')
@@ -0,0 +1,30 @@
+"""add outbox publish seq
+
+Revision ID: d84b1f0c37e2
+Revises: e5a7d2c90f3b
+Create Date: 2026-10-19 23:40:27.113905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84b1f0c37e2'
+down_revision: Union[str, None] = 'e5a7d2c90f3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('outbox_publish_seq')))
+    op.add_column('outbox', sa.Column('published_seq', sa.BigInteger(), nullable=True))
+    op.create_index('ix_outbox_published_seq', 'outbox', ['published_seq'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_published_seq', table_name='outbox')
+    op.drop_column('outbox', 'published_seq')
+    op.execute(sa.schema.DropSequence(sa.Sequence('outbox_publish_seq')))
@@ -0,0 +1,39 @@
+"""add month day indexes
+
+Revision ID: e5a7d2c90f3b
+Revises: c41f8e2b6a17
+Create Date: 2026-10-19 21:05:12.640218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7d2c90f3b'
+down_revision: Union[str, None] = 'c41f8e2b6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Must match databasemodels.month_day exactly for the planner to use them.
+    op.create_index(
+        'ix_user_birthday_month_day',
+        'user',
+        [sa.text('CAST(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday) AS INTEGER)')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_user_joined_at_month_day',
+        'user',
+        [sa.text('CAST(EXTRACT(month FROM joined_at) * 100 + EXTRACT(day FROM joined_at) AS INTEGER)')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_joined_at_month_day', table_name='user')
+    op.drop_index('ix_user_birthday_month_day', table_name='user')
@@ -11,10 +11,16 @@ done
 echo "Database is up - running migrations"
 alembic upgrade head
 
+echo "Creating superuser if missing..."
+python -m src.utils.create_superuser
+
+echo "Creating upcoming vacation partitions..."
+python -m src.utils.partitions
+
 echo "Starting background task for listening to expired keys..."
 python -c "from src.services.redis import listen_for_expiration_keys; import asyncio; asyncio.run(listen_for_expiration_keys())" &
 
 UVICORN_WORKERS=${UVICORN_WORKERS:-1}
 
 echo "Starting application with $UVICORN_WORKERS workers..."
-exec gunicorn src.main:app --workers "$UVICORN_WORKERS" --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
\ No newline at end of file
+exec gunicorn src.main:app --workers "$UVICORN_WORKERS" --worker-class uvicorn.workers.UvicornWorker --graceful-timeout "${GRACEFUL_TIMEOUT:-30}" --bind 0.0.0.0:8000
\ No newline at end of file
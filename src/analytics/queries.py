@@ -0,0 +1,82 @@
+from sqlalchemy import (
+    Date,
+    Integer,
+    bindparam,
+    distinct,
+    func,
+    literal_column,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from src.config import VACATION_MAX_DAYS
+from src.databasemodels import Position, Section, User, Vacation
+
+first_day = bindparam("first_day", type_=Date)
+last_day = bindparam("last_day", type_=Date)
+
+# One row per vacation day inside the requested month.
+vacation_days = (
+    func.generate_series(
+        func.greatest(Vacation.start_date, first_day),
+        func.least(Vacation.end_date, last_day),
+        literal_column("interval '1 day'"),
+    )
+    .table_valued("day")
+    .lateral()
+)
+
+
+def in_month(query):
+    # Same partition-pruning bound as vacation.queries.active_on.
+    return query.join(vacation_days, true()).filter(
+        Vacation.start_date <= last_day,
+        Vacation.start_date >= first_day - VACATION_MAX_DAYS,
+        Vacation.end_date >= first_day,
+    )
+
+
+section_daily = in_month(
+    select(
+        Position.section_id,
+        func.date(vacation_days.c.day).label("day"),
+        func.count(distinct(Vacation.receiver_id)).label("absent"),
+    )
+    .select_from(Vacation)
+    .join(User, User.id == Vacation.receiver_id)
+    .join(Position, Position.id == User.position_id)
+    .filter(Position.section_id.is_not(None))
+).group_by(Position.section_id, vacation_days.c.day)
+section_daily = section_daily.subquery()
+
+sections_absence_query = (
+    select(
+        Section.id,
+        Section.name,
+        func.sum(section_daily.c.absent).label("days_off"),
+        func.max(section_daily.c.absent).label("peak_absent"),
+        func.array_agg(
+            aggregate_order_by(
+                section_daily.c.day,
+                section_daily.c.absent.desc(),
+                section_daily.c.day,
+            )
+        )[1].label("peak_day"),
+    )
+    .join(section_daily, section_daily.c.section_id == Section.id)
+    .group_by(Section.id, Section.name)
+    .order_by(Section.name)
+)
+
+peak_days_query = (
+    in_month(
+        select(
+            func.date(vacation_days.c.day).label("day"),
+            func.count(distinct(Vacation.receiver_id)).label("absent"),
+        ).select_from(Vacation)
+    )
+    .group_by(vacation_days.c.day)
+    .order_by(func.count(distinct(Vacation.receiver_id)).desc(), vacation_days.c.day)
+    .limit(bindparam("limit", type_=Integer))
+)
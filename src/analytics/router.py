@@ -0,0 +1,96 @@
+import calendar
+from datetime import date
+from typing import Annotated
+from fastapi import APIRouter, Depends, Path, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.analytics.queries import peak_days_query, sections_absence_query
+from src.analytics.schemas import AbsenceDay, MonthAbsence, SectionAbsence
+from src.auth.schemas import UserSessionInfo
+from src.database import get_async_session
+from src.services.cache import (
+    CachedResponse,
+    ResponseCache,
+    etag_matches,
+    get_generations,
+)
+from src.services.ratelimit import RateLimiter
+from src.services.redis import get_current_user
+from src.utils.logger import logger
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+PEAK_DAYS = 5
+
+# Grouping depends on who sits in which section, so any user, position or
+# section change invalidates every month; vacations only their own months.
+GROUPING_TABLES = ("user", "position", "section")
+
+month_absence_cache = ResponseCache(max_entries=64)
+
+
+async def build_month_absence(session: AsyncSession, year: int, month: int):
+    params = {
+        "first_day": date(year, month, 1),
+        "last_day": date(year, month, calendar.monthrange(year, month)[1]),
+    }
+    sections = await session.execute(sections_absence_query, params)
+    peak_days = await session.execute(peak_days_query, {**params, "limit": PEAK_DAYS})
+
+    return MonthAbsence(
+        year=year,
+        month=month,
+        sections=[
+            SectionAbsence(
+                section_id=section_id,
+                section_name=section_name,
+                days_off=days_off,
+                peak_absent=peak_absent,
+                peak_day=peak_day,
+            )
+            for section_id, section_name, days_off, peak_absent, peak_day in sections
+        ],
+        peak_days=[AbsenceDay(day=day, absent=absent) for day, absent in peak_days],
+    )
+
+
+@router.get(
+    "/absence/{year}/{month}",
+    response_model=MonthAbsence,
+    dependencies=[Depends(RateLimiter(cost=5))],
+)
+async def get_month_absence(
+    user: Annotated[UserSessionInfo, Depends(get_current_user)],
+    request: Request,
+    year: int = Path(ge=2000, le=2100, description="Год"),
+    month: int = Path(ge=1, le=12, description="Месяц"),
+    # Cached and ETagged under the generations read above, so the report has
+    # to come from the primary; a lagging replica would pin pre-write data.
+    session: AsyncSession = Depends(get_async_session),
+):
+    generations = await get_generations(
+        f"vacation:{year}-{month:02d}", *GROUPING_TABLES
+    )
+    key = (year, month, generations)
+    etag = (
+        f'"absence-{year}-{month}-{"-".join(map(str, generations))}"'
+        if generations
+        else None
+    )
+
+    if etag_matches(request, etag):
+        logger.info(f"{user.email}: Absence of {year}-{month} not modified")
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    cached = month_absence_cache.get(key) if generations else None
+    if cached is None:
+        report = await build_month_absence(session, year, month)
+        cached = CachedResponse(report.model_dump_json().encode("utf-8"), etag)
+        if generations:
+            month_absence_cache.set(key, cached)
+
+    body, headers = cached.for_request(request)
+    logger.info(f"{user.email}: Selected absence of {year}-{month}")
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,22 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class SectionAbsence(BaseModel):
+    section_id: int
+    section_name: str
+    days_off: int
+    peak_day: date
+    peak_absent: int
+
+
+class AbsenceDay(BaseModel):
+    day: date
+    absent: int
+
+
+class MonthAbsence(BaseModel):
+    year: int
+    month: int
+    sections: list[SectionAbsence]
+    peak_days: list[AbsenceDay]
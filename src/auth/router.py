@@ -1,53 +1,87 @@
 from typing import Annotated
-import bcrypt
 from fastapi import APIRouter, Depends
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from datetime import datetime, timedelta, timezone
 from fastapi.responses import JSONResponse
-from sqlalchemy import insert, select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.schemas import LoginRequest, UserCreate, UserSessionInfo
+from src.config import AUTH_MODE
 from src.databasemodels import User
 from src.database import get_async_session
+from src.services.outbox import record_event
 from src.utils.logger import logger
 from src.services.redis import (
     create_session,
     get_current_superuser,
+    load_session,
     remove_session,
+    set_access_cookie,
 )
+from src.services.ratelimit import (
+    check_login_attempt,
+    forget_login_attempt,
+    forget_unknown_email,
+    remember_unknown_email,
+)
+from src.services.password import (
+    dummy_hashes,
+    hash_password_async,
+    verify_password_async,
+)
+from src.services.token import ACCESS_COOKIE
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed_password.decode("utf-8")
-
-
-def verify_password(user_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(
-        user_password.encode("utf-8"), hashed_password.encode("utf-8")
+def reject_login(credentials: LoginRequest):
+    logger.warning(f"Login failed for {credentials.email}: Invalid email or password")
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail="Bad credentials"
     )
 
 
 @router.post("/login")
 async def login(
     credentials: LoginRequest,
+    request: Request,
     response: Response,
     session: AsyncSession = Depends(get_async_session),
 ):
+    ip = request.client.host if request.client else "unknown"
+    attempt, is_unknown = await check_login_attempt(ip, credentials.email)
+
+    # Unknown emails still pay for a hash check so response time does not
+    # reveal which accounts exist.
+    if is_unknown:
+        await verify_password_async(
+            credentials.password, await dummy_hashes.for_email(credentials.email)
+        )
+        reject_login(credentials)
+
     query = select(User).filter(User.email == credentials.email)
     result = await session.execute(query)
     user = result.scalar_one_or_none()
-    if not user or not verify_password(credentials.password, user.hashed_password):
-        logger.warning(
-            f"Login failed for {credentials.email}: Invalid email or password"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Bad credentials"
+    if not user:
+        await remember_unknown_email(credentials.email)
+        await verify_password_async(
+            credentials.password, await dummy_hashes.for_email(credentials.email)
         )
+        reject_login(credentials)
+    verified, new_hash = await verify_password_async(
+        credentials.password, user.hashed_password
+    )
+    if not verified:
+        reject_login(credentials)
+
+    if new_hash is not None:
+        stmt = update(User).values(hashed_password=new_hash).filter(User.id == user.id)
+        await session.execute(stmt)
+        await session.commit()
+        logger.info(f"{user.email}: Password rehashed")
+
+    await forget_login_attempt(ip, credentials.email, attempt)
     session_value = await create_session(user.id, user.email, user.is_superuser)
 
     response.set_cookie(
@@ -56,6 +90,16 @@ async def login(
         httponly=True,
     )
 
+    if AUTH_MODE == "token":
+        _, session_uuid = session_value.split(":", 1)
+        set_access_cookie(
+            response,
+            UserSessionInfo(
+                id=user.id, email=user.email, is_superuser=user.is_superuser
+            ),
+            session_uuid,
+        )
+
     logger.info(f"User {user.email} login")
     return {"message": "Login successful"}
 
@@ -66,7 +110,7 @@ async def register(
     user_data: UserCreate,
     session: AsyncSession = Depends(get_async_session),
 ):
-    hashed_password = hash_password(password=user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     user_create = {
         "name": user_data.name,
         "surname": user_data.surname,
@@ -78,7 +122,9 @@ async def register(
     }
     stmt = insert(User).values(user_create)
     await session.execute(stmt)
+    record_event(session, "user.created", ("user",), {"email": user_data.email})
     await session.commit()
+    await forget_unknown_email(user_data.email)
     logger.info(f"{user.email}: Register user {user_data.email}")
     return JSONResponse(
         content={"message": f"User {user_data.email} created"},
@@ -106,5 +152,17 @@ async def logout(response: Response, request: Request):
         secure=False,
         samesite="Lax",
     )
+    response.delete_cookie(ACCESS_COOKIE, httponly=True)
 
     return {"message": "Successfully logged out"}
+
+
+@router.post("/refresh")
+async def refresh(request: Request, response: Response):
+    user, session_uuid = await load_session(request)
+
+    if AUTH_MODE == "token":
+        set_access_cookie(response, user, session_uuid)
+
+    logger.info(f"User {user.email} refreshed session")
+    return {"message": "Session refreshed"}
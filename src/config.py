@@ -13,3 +13,57 @@ SUPERUSER_PASSWORD = os.environ.get("SUPERUSER_PASSWORD")
 TEST_URL = os.environ.get("TEST_URL")
 REDIS_HOST = "redis"
 REDIS_PORT = "6379"
+AUTH_MODE = os.environ.get("AUTH_MODE", "session")
+JWT_SECRET = os.environ.get("JWT_SECRET")
+JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
+ACCESS_TOKEN_TTL = int(os.environ.get("ACCESS_TOKEN_TTL", 300))
+REVOCATION_SYNC_INTERVAL = float(os.environ.get("REVOCATION_SYNC_INTERVAL", 5))
+LOGIN_RATE_WINDOW = int(os.environ.get("LOGIN_RATE_WINDOW", 60))
+LOGIN_IP_LIMIT = int(os.environ.get("LOGIN_IP_LIMIT", 30))
+LOGIN_EMAIL_LIMIT = int(os.environ.get("LOGIN_EMAIL_LIMIT", 5))
+UNKNOWN_EMAIL_TTL = int(os.environ.get("UNKNOWN_EMAIL_TTL", 300))
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_CAPACITY = int(os.environ.get("RATE_LIMIT_CAPACITY", 60))
+RATE_LIMIT_REFILL_RATE = float(os.environ.get("RATE_LIMIT_REFILL_RATE", 1))
+DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+DB_REPLICA_PORT = os.environ.get("DB_REPLICA_PORT", DB_PORT)
+REPLICA_MAX_LAG = float(os.environ.get("REPLICA_MAX_LAG", 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get("REPLICA_LAG_CHECK_INTERVAL", 5))
+READ_YOUR_WRITES_TTL = int(os.environ.get("READ_YOUR_WRITES_TTL", 10))
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 500))
+VACATION_PARTITIONS_AHEAD = int(os.environ.get("VACATION_PARTITIONS_AHEAD", 2))
+VACATION_MAX_DAYS = int(os.environ.get("VACATION_MAX_DAYS", 1096))
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_LEVEL = int(os.environ.get("COMPRESSION_LEVEL", 6))
+STARTUP_WARM_CONNECTIONS = int(os.environ.get("STARTUP_WARM_CONNECTIONS", 2))
+SHUTDOWN_DRAIN_TIMEOUT = float(os.environ.get("SHUTDOWN_DRAIN_TIMEOUT", 20))
+SHUTDOWN_PRESTOP_DELAY = float(os.environ.get("SHUTDOWN_PRESTOP_DELAY", 5))
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+HEALTH_PROBE_TIMEOUT = float(os.environ.get("HEALTH_PROBE_TIMEOUT", 1))
+HEALTH_CACHE_TTL = float(os.environ.get("HEALTH_CACHE_TTL", 2))
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", 19456))
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", 1))
+DUMMY_HASH_KEY = os.environ.get("DUMMY_HASH_KEY") or JWT_SECRET or DB_PASS or ""
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", 86400))
+IDEMPOTENCY_LOCK_TTL = int(os.environ.get("IDEMPOTENCY_LOCK_TTL", 30))
+IDEMPOTENCY_WAIT = float(os.environ.get("IDEMPOTENCY_WAIT", 5))
+SINGLE_FLIGHT_REDIS = os.environ.get("SINGLE_FLIGHT_REDIS", "false").lower() == "true"
+SINGLE_FLIGHT_TTL = int(os.environ.get("SINGLE_FLIGHT_TTL", 2))
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 100))
+OUTBOX_POLL_INTERVAL = float(os.environ.get("OUTBOX_POLL_INTERVAL", 1))
+OUTBOX_RETENTION_DAYS = int(os.environ.get("OUTBOX_RETENTION_DAYS", 7))
+VACATION_DAYS_PER_YEAR = int(os.environ.get("VACATION_DAYS_PER_YEAR", 28))
+JOB_WORKER_IN_APP = os.environ.get("JOB_WORKER_IN_APP", "true").lower() == "true"
+JOB_CONCURRENCY = int(os.environ.get("JOB_CONCURRENCY", 2))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_DELAY = float(os.environ.get("JOB_RETRY_DELAY", 5))
+JOB_TIMEOUT = float(os.environ.get("JOB_TIMEOUT", 300))
+JOB_TTL = int(os.environ.get("JOB_TTL", 86400))
+BULK_UPDATE_MAX_ITEMS = int(os.environ.get("BULK_UPDATE_MAX_ITEMS", 1000))
+CHANGE_FEED_BUFFER = int(os.environ.get("CHANGE_FEED_BUFFER", 100))
+CHANGE_FEED_HEARTBEAT = float(os.environ.get("CHANGE_FEED_HEARTBEAT", 15))
+CHANGE_FEED_MAX_CLIENTS = int(os.environ.get("CHANGE_FEED_MAX_CLIENTS", 500))
+CHANGE_FEED_REPLAY_LIMIT = int(os.environ.get("CHANGE_FEED_REPLAY_LIMIT", 500))
+CHANGE_FEED_MAX_AGE = float(os.environ.get("CHANGE_FEED_MAX_AGE", 900))
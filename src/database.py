@@ -1,18 +1,146 @@
+import time
 from typing import AsyncGenerator
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.datastructures import MutableHeaders
 
-from src.config import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+from src.config import (
+    DB_HOST,
+    DB_MAX_OVERFLOW,
+    DB_NAME,
+    DB_PASS,
+    DB_POOL_SIZE,
+    DB_PORT,
+    DB_REPLICA_HOST,
+    DB_REPLICA_PORT,
+    DB_USER,
+    READ_YOUR_WRITES_TTL,
+    REPLICA_LAG_CHECK_INTERVAL,
+    REPLICA_MAX_LAG,
+)
 from src.databasemodels import User
+from src.utils.logger import logger
+from src.utils.query_stats import track_compiled_cache
 
 
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+REPLICA_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
 
 
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(
+    DATABASE_URL, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW
+)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+replica_engine = (
+    create_async_engine(
+        REPLICA_DATABASE_URL, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW
+    )
+    if DB_REPLICA_HOST
+    else None
+)
+replica_session_maker = (
+    async_sessionmaker(replica_engine, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+track_compiled_cache(engine.sync_engine)
+if replica_engine is not None:
+    track_compiled_cache(replica_engine.sync_engine)
+
+PRIMARY_COOKIE = "primary_until"
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaLag:
+    def __init__(self):
+        self.seconds: float | None = None
+        self.checked_at = 0.0
+
+    async def is_acceptable(self) -> bool:
+        if time.monotonic() - self.checked_at > REPLICA_LAG_CHECK_INTERVAL:
+            # Set before awaiting so concurrent requests don't all probe.
+            self.checked_at = time.monotonic()
+            try:
+                async with replica_engine.connect() as conn:
+                    self.seconds = float(await conn.scalar(REPLICA_LAG_QUERY))
+            except (SQLAlchemyError, OSError) as e:
+                logger.warning(f"Replica lag check failed: {e}")
+                self.seconds = None
+
+            if self.seconds is not None and self.seconds > REPLICA_MAX_LAG:
+                logger.warning(f"Replica lags {self.seconds:.1f}s, reading primary")
+
+        return self.seconds is not None and self.seconds <= REPLICA_MAX_LAG
+
+
+replica_lag = ReplicaLag()
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_session_maker(request: Request) -> async_sessionmaker:
+    if (
+        replica_session_maker is not None
+        and not wrote_recently(request)
+        and await replica_lag.is_acceptable()
+    ):
+        return replica_session_maker
+    return async_session_maker
+
+
+def reads_replica(session_maker: async_sessionmaker) -> bool:
+    return replica_session_maker is not None and session_maker is replica_session_maker
+
+
+async def get_read_session(
+    session_maker: async_sessionmaker = Depends(get_read_session_maker),
+) -> AsyncGenerator[AsyncSession, None]:
+    async with session_maker() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary for a while after a successful mutation;
+    a cookie, so it holds across workers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or replica_engine is None
+        ):
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time()) + READ_YOUR_WRITES_TTL
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_COOKIE}={until}; Max-Age={READ_YOUR_WRITES_TTL}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
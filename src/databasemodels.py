@@ -1,14 +1,33 @@
-from datetime import date
-from sqlalchemy import Date, ForeignKey, Index
+from datetime import date, datetime
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    CheckConstraint,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Sequence,
+    String,
+    cast,
+    event,
+    extract,
+    func,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship, DeclarativeBase
 
+from src.config import VACATION_MAX_DAYS
+
 
 class Base(DeclarativeBase): ...
 
 
 class Vacation(Base):
     __tablename__ = "vacation"
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     giver_id: Mapped[int] = mapped_column(
         ForeignKey(
             "user.id",
@@ -26,7 +45,8 @@ class Vacation(Base):
             ondelete="CASCADE",
         ),
     )
-    start_date = mapped_column(Date, default=date.today)
+    # Partition key, so it has to be part of the primary key.
+    start_date = mapped_column(Date, primary_key=True, default=date.today)
     end_date = mapped_column(Date)
     created_date = mapped_column(Date, default=date.today)
     description: Mapped[str] = mapped_column(nullable=True)
@@ -45,9 +65,24 @@ class Vacation(Base):
         Index("ix_vacation_start_date", start_date),
         Index("ix_vacation_end_date", end_date),
         Index("ix_vacation_dates", start_date, end_date),
+        # Queries bound start_date by it to prune partitions.
+        CheckConstraint(
+            f"end_date - start_date <= {VACATION_MAX_DAYS}",
+            name="ck_vacation_max_days",
+        ),
+        {"postgresql_partition_by": "RANGE (start_date)"},
     )
 
 
+# Yearly partitions are attached by src.utils.partitions; the default one
+# keeps inserts working before they exist (and in tests using create_all).
+event.listen(
+    Vacation.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS vacation_default PARTITION OF vacation DEFAULT"),
+)
+
+
 class Section(Base):
     __tablename__ = "section"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -83,6 +118,15 @@ class Position(Base):
     __table_args__ = (Index("ix_position_section_name", section_id),)
 
 
+def month_day(column):
+    """MMDD of a date as an integer, so yearly dates compare across years."""
+    # A literal, not a bound parameter, so the SQL matches the index expression.
+    return cast(
+        extract("month", column) * literal_column("100") + extract("day", column),
+        Integer,
+    )
+
+
 class User(Base):
     __tablename__ = "user"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -114,4 +158,51 @@ class User(Base):
     __table_args__ = (
         Index("ix_user_position_name", position_id),
         Index("ix_user_surname_name", surname, name),
+        Index("ix_user_birthday_month_day", month_day(birthday)),
+        Index("ix_user_joined_at_month_day", month_day(joined_at)),
+    )
+
+
+class VacationLedger(Base):
+    """Vacation days taken per user and calendar year, kept in step with
+    vacation inserts and rebuilt by src.utils.vacation_ledger."""
+
+    __tablename__ = "vacation_ledger"
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", name="fk_vacation_ledger_user", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    year: Mapped[int] = mapped_column(primary_key=True)
+    days_taken: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+# Numbers events in the order they are published, which the change feed
+# replays by; ids follow insert order, which commits and dispatch don't.
+outbox_publish_seq = Sequence("outbox_publish_seq", metadata=Base.metadata)
+
+
+class OutboxEvent(Base):
+    """Change written in the same transaction as the data it describes and
+    published to the other workers by src.services.outbox."""
+
+    __tablename__ = "outbox"
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event: Mapped[str] = mapped_column(nullable=False)
+    tables = mapped_column(ARRAY(String), nullable=False)
+    payload = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    published_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    published_seq: Mapped[int] = mapped_column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_unpublished",
+            id,
+            postgresql_where=published_at.is_(None),
+        ),
+        Index("ix_outbox_published_seq", published_seq, unique=True),
     )
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, bindparam, case, column, select, table
+
+from src.databasemodels import OutboxEvent
+
+replay_query = (
+    select(
+        OutboxEvent.published_seq,
+        OutboxEvent.event,
+        OutboxEvent.tables,
+        OutboxEvent.payload,
+    )
+    .filter(
+        OutboxEvent.published_seq > bindparam("after", type_=BigInteger),
+        OutboxEvent.published_seq <= bindparam("upto", type_=BigInteger),
+    )
+    .order_by(OutboxEvent.published_seq)
+)
+
+# The last number handed out, including to events whose dispatch has not
+# committed yet; 0 before the first one.
+publish_seq = table("outbox_publish_seq", column("last_value"), column("is_called"))
+published_upto_query = select(
+    case((publish_seq.c.is_called, publish_seq.c.last_value), else_=0)
+)
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.schemas import UserSessionInfo
+from src.config import (
+    CHANGE_FEED_HEARTBEAT,
+    CHANGE_FEED_MAX_AGE,
+    CHANGE_FEED_REPLAY_LIMIT,
+)
+from src.database import get_async_session
+from src.feed.queries import published_upto_query, replay_query
+from src.services.changefeed import (
+    CLOSED,
+    DROPPED,
+    RESYNC,
+    FEED_TABLES,
+    Subscriber,
+    change_feed,
+    event_topics,
+    format_event,
+)
+from src.services.redis import get_current_user
+from src.utils.logger import logger
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+# Browsers wait this long before reconnecting with Last-Event-ID.
+RETRY_MS = 3000
+# A missed event can be numbered and published but not yet committed.
+REPLAY_ATTEMPTS = 3
+REPLAY_RETRY_DELAY = 0.05
+
+
+async def replay_missed(
+    session: AsyncSession, last_seq: int, topics: set[str]
+) -> tuple[list[dict] | None, int]:
+    """Events after last_seq and the last number published; the events are
+    None when the client has to refetch instead."""
+    upto = await session.scalar(published_upto_query)
+    missed = upto - last_seq
+    if not 0 <= missed <= CHANGE_FEED_REPLAY_LIMIT:
+        return None, upto
+
+    for _ in range(REPLAY_ATTEMPTS):
+        rows = await session.execute(replay_query, {"after": last_seq, "upto": upto})
+        rows = rows.all()
+        if len(rows) == missed:
+            return [
+                {"seq": seq, "event": name, "tables": tables, "payload": payload}
+                for seq, name, tables, payload in rows
+                if topics & event_topics(tables)
+            ], upto
+        await asyncio.sleep(REPLAY_RETRY_DELAY)
+    return None, upto
+
+
+async def stream_changes(
+    subscriber: Subscriber, replayed: list[dict], email: str, replayed_upto: int = 0
+):
+    # Streams end after CHANGE_FEED_MAX_AGE so clients reconnect and their
+    # session is checked again.
+    deadline = time.monotonic() + CHANGE_FEED_MAX_AGE
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        for message in replayed:
+            yield format_event(message)
+
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                message = await asyncio.wait_for(
+                    subscriber.queue.get(), min(CHANGE_FEED_HEARTBEAT, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+
+            # Published while replaying, so already sent.
+            if message.get("seq", replayed_upto + 1) <= replayed_upto:
+                continue
+            yield format_event(message)
+            if message is DROPPED or message is CLOSED:
+                logger.info(f"{email}: Change feed {message['event']}")
+                return
+    finally:
+        change_feed.unsubscribe(subscriber)
+
+
+@router.get("/changes")
+async def get_changes(
+    user: Annotated[UserSessionInfo, Depends(get_current_user)],
+    tables: list[Literal[FEED_TABLES]] = Query(
+        list(FEED_TABLES), description="Таблицы, изменения которых нужны"
+    ),
+    last_event_id: int | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    topics = set(tables)
+    # Subscribe before replaying so nothing published in between is lost.
+    subscriber = change_feed.subscribe(topics)
+    if subscriber is None:
+        logger.warning(f"{user.email}: Change feed is full")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many change feed clients",
+        )
+
+    replayed, replayed_upto = [], 0
+    if last_event_id is not None:
+        try:
+            replayed, replayed_upto = await replay_missed(
+                session, last_event_id, topics
+            )
+        except BaseException:
+            change_feed.unsubscribe(subscriber)
+            raise
+        if replayed is None:
+            # The refetch may predate anything published from here on.
+            replayed, replayed_upto = [RESYNC], 0
+
+    logger.info(f"{user.email}: Subscribed to changes of {sorted(topics)}")
+    return StreamingResponse(
+        stream_changes(subscriber, replayed, user.email, replayed_upto),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    HEALTH_CACHE_TTL,
+    HEALTH_PROBE_TIMEOUT,
+)
+from src.database import engine, replica_engine
+from src.health.schemas import DependencyHealth, PoolStats, ReadinessResponse
+from src.services import redis as redis_service
+from src.utils.logger import logger
+from src.utils.shutdown import drain
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+async def probe(check) -> DependencyHealth:
+    started = time.perf_counter()
+    error = None
+    try:
+        await asyncio.wait_for(check(), HEALTH_PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        error = f"timed out after {HEALTH_PROBE_TIMEOUT}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    return DependencyHealth(ok=error is None, latency_ms=latency_ms, error=error)
+
+
+async def check_postgres():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_redis():
+    await redis_service.redis_client.ping()
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats:
+    pool = engine.pool
+    return PoolStats(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        saturation=round(pool.checkedout() / (DB_POOL_SIZE + DB_MAX_OVERFLOW), 2),
+    )
+
+
+class ReadinessCache:
+    """Last probe result, shared by every caller for HEALTH_CACHE_TTL seconds
+    so frequent load balancer checks don't each hit Postgres and Redis."""
+
+    def __init__(self):
+        self.result: tuple[DependencyHealth, DependencyHealth] | None = None
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def get(self) -> tuple[DependencyHealth, DependencyHealth]:
+        async with self.lock:
+            if (
+                self.result is None
+                or time.monotonic() - self.checked_at > HEALTH_CACHE_TTL
+            ):
+                self.result = await asyncio.gather(
+                    probe(check_postgres), probe(check_redis)
+                )
+                self.checked_at = time.monotonic()
+            return self.result
+
+
+readiness_cache = ReadinessCache()
+
+
+@router.get("/live")
+async def get_liveness():
+    return {"status": "alive"}
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def get_readiness():
+    postgres, redis = await readiness_cache.get()
+    pools = {"primary": pool_stats(engine)}
+    if replica_engine is not None:
+        pools["replica"] = pool_stats(replica_engine)
+
+    if drain.draining:
+        health_status = "draining"
+    elif postgres.ok and redis.ok:
+        health_status = "ready"
+    else:
+        health_status = "unavailable"
+        logger.warning(f"Not ready: postgres {postgres.error}, redis {redis.error}")
+
+    readiness = ReadinessResponse(
+        status=health_status, postgres=postgres, redis=redis, pools=pools
+    )
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK
+            if health_status == "ready"
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content=readiness.model_dump(),
+    )
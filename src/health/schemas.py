@@ -0,0 +1,22 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class DependencyHealth(BaseModel):
+    ok: bool
+    latency_ms: float
+    error: str | None = None
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    saturation: float
+
+
+class ReadinessResponse(BaseModel):
+    status: Literal["ready", "unavailable", "draining"]
+    postgres: DependencyHealth
+    redis: DependencyHealth
+    pools: dict[str, PoolStats]
@@ -0,0 +1,44 @@
+import json
+from datetime import datetime, timezone
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.auth.schemas import UserSessionInfo
+from src.jobs.schemas import JobRead
+from src.services.jobs import get_job
+from src.services.redis import get_current_superuser
+from src.utils.logger import logger
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def timestamp(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job_status(
+    user: Annotated[UserSessionInfo, Depends(get_current_superuser)],
+    job_id: str,
+):
+    data = await get_job(job_id)
+    if data is None:
+        logger.warning(f"{user.email}: Trying to select a non-existent job {job_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+
+    return JobRead(
+        id=job_id,
+        name=data["name"],
+        status=data["status"],
+        attempts=int(data["attempts"]),
+        requested_by=data["requested_by"],
+        created_at=timestamp(data["created_at"]),
+        started_at=timestamp(data.get("started_at")),
+        finished_at=timestamp(data.get("finished_at")),
+        error=data.get("error"),
+        result=json.loads(data["result"]) if "result" in data else None,
+    )
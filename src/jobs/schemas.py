@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel
+
+
+class JobRead(BaseModel):
+    id: str
+    name: str
+    status: Literal["queued", "running", "retrying", "succeeded", "failed"]
+    attempts: int
+    requested_by: str
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    result: dict | None = None
@@ -1,3 +1,8 @@
+import asyncio
+import time
+
+IMPORT_STARTED = time.perf_counter()
+
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
@@ -6,23 +11,68 @@ from src.auth.router import router as regRouter
 from src.vacation.router import router as vacRouter
 from src.position.router import router as posRouter
 from src.section.router import router as secRouter
-from src.utils.create_superuser import create_superuser
+from src.org.router import router as orgRouter
+from src.health.router import router as healthRouter
+from src.analytics.router import router as analyticsRouter
+from src.jobs.router import router as jobsRouter
+from src.feed.router import router as feedRouter
+from src.database import ReadYourWritesMiddleware
+from src.config import JOB_WORKER_IN_APP
+from src.services.changefeed import change_feed
+from src.services.idempotency import IdempotencyMiddleware
+from src.services.jobs import run_worker
+from src.services.outbox import start_outbox
+from src.utils.compression import CompressionMiddleware
 from src.utils.logger import logger
+from src.utils.query_stats import compiled_cache_report
+from src.utils.shutdown import (
+    DrainMiddleware,
+    cancel_tasks,
+    drain,
+    install_signal_handlers,
+    shutdown,
+)
+from src.utils.startup import format_timings, warm_up
+from src.vacation.rollover import run_day_rollover
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("App is starting")
-    await create_superuser()
+    timings = {"imports": IMPORT_SECONDS, **await warm_up()}
+    logger.info(f"Startup: {format_timings(timings)}")
+    # SIGTERM ends open change feeds during the pre-stop window; Uvicorn
+    # would otherwise wait for them until the graceful timeout.
+    drain.on_begin(change_feed.close)
+    install_signal_handlers()
+    tasks = [*start_outbox(), asyncio.create_task(run_day_rollover())]
+    if JOB_WORKER_IN_APP:
+        tasks.append(asyncio.create_task(run_worker()))
     yield
+    await cancel_tasks(tasks)
+    logger.info(f"Compiled query cache: {compiled_cache_report()}")
     logger.info("App is shutting down")
+    await shutdown()
+    logger.info("Connections closed")
 
 
 app = FastAPI(title="FastAPI Project", lifespan=lifespan)
 
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(DrainMiddleware)
+
 
 app.include_router(regRouter)
 app.include_router(userRouter)
 app.include_router(vacRouter)
 app.include_router(posRouter)
 app.include_router(secRouter)
+app.include_router(orgRouter)
+app.include_router(analyticsRouter)
+app.include_router(jobsRouter)
+app.include_router(feedRouter)
+app.include_router(healthRouter)
@@ -0,0 +1,27 @@
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from src.databasemodels import Position, Section, User
+
+head = aliased(User)
+
+# Full joins keep sections without positions, positions without a section
+# and users without a position in the same result set.
+org_tree_query = (
+    select(
+        Section.id,
+        Section.name,
+        head.email,
+        Position.id,
+        Position.name,
+        User.id,
+        User.name,
+        User.surname,
+        User.email,
+    )
+    .select_from(User)
+    .join(Position, User.position_id == Position.id, full=True)
+    .join(Section, Position.section_id == Section.id, full=True)
+    .outerjoin(head, Section.head_id == head.id)
+    .order_by(Section.name, Position.name, User.surname, User.name)
+)
@@ -0,0 +1,98 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.schemas import UserSessionInfo
+from src.database import get_async_session
+from src.org.queries import org_tree_query
+from src.org.schemas import OrgPosition, OrgSection, OrgTree, OrgUser
+from src.services.cache import (
+    CachedResponse,
+    ResponseCache,
+    etag_matches,
+    get_generations,
+)
+from src.services.redis import get_current_user
+from src.utils.logger import logger
+
+router = APIRouter(prefix="/org", tags=["org"])
+
+ORG_TABLES = ("section", "position", "user")
+
+org_tree_cache = ResponseCache(max_entries=4)
+
+
+def build_org_tree(rows) -> OrgTree:
+    sections: dict[int, OrgSection] = {}
+    positions: dict[int, OrgPosition] = {}
+    unassigned_positions: list[OrgPosition] = []
+    unassigned_users: list[OrgUser] = []
+
+    for (
+        section_id,
+        section_name,
+        head_email,
+        position_id,
+        position_name,
+        user_id,
+        user_name,
+        user_surname,
+        user_email,
+    ) in rows:
+        if section_id is not None and section_id not in sections:
+            sections[section_id] = OrgSection(
+                id=section_id, name=section_name, head_email=head_email, positions=[]
+            )
+
+        if position_id is not None and position_id not in positions:
+            position = OrgPosition(id=position_id, name=position_name, users=[])
+            positions[position_id] = position
+            if section_id is None:
+                unassigned_positions.append(position)
+            else:
+                sections[section_id].positions.append(position)
+
+        if user_id is not None:
+            org_user = OrgUser(
+                id=user_id, name=user_name, surname=user_surname, email=user_email
+            )
+            if position_id is None:
+                unassigned_users.append(org_user)
+            else:
+                positions[position_id].users.append(org_user)
+
+    return OrgTree(
+        sections=list(sections.values()),
+        unassigned_positions=unassigned_positions,
+        unassigned_users=unassigned_users,
+    )
+
+
+@router.get("/tree", response_model=OrgTree)
+async def get_org_tree(
+    user: Annotated[UserSessionInfo, Depends(get_current_user)],
+    request: Request,
+    # The primary, not the replica: an entry built from a lagging replica
+    # would hold pre-write data under the post-write generation. Hits never
+    # query, so this is one primary read per generation per worker.
+    session: AsyncSession = Depends(get_async_session),
+):
+    generations = await get_generations(*ORG_TABLES)
+    etag = f'"org-{"-".join(map(str, generations))}"' if generations else None
+    headers = {"ETag": etag} if etag else None
+
+    if etag_matches(request, etag):
+        logger.info(f"{user.email}: Org tree not modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = org_tree_cache.get(generations) if generations else None
+    if cached is None:
+        results = await session.execute(org_tree_query)
+        tree = build_org_tree(results.all())
+        cached = CachedResponse(tree.model_dump_json().encode("utf-8"), etag)
+        if generations:
+            org_tree_cache.set(generations, cached)
+
+    body, headers = cached.for_request(request)
+    logger.info(f"{user.email}: Selected org tree")
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, EmailStr
+
+
+class OrgUser(BaseModel):
+    id: int
+    name: str
+    surname: str
+    email: EmailStr
+
+
+class OrgPosition(BaseModel):
+    id: int
+    name: str
+    users: list[OrgUser]
+
+
+class OrgSection(BaseModel):
+    id: int
+    name: str
+    head_email: EmailStr | None
+    positions: list[OrgPosition]
+
+
+class OrgTree(BaseModel):
+    sections: list[OrgSection]
+    unassigned_positions: list[OrgPosition]
+    unassigned_users: list[OrgUser]
@@ -0,0 +1,57 @@
+from functools import cache
+from sqlalchemy import Integer, String, bindparam, column, select, update, values
+from sqlalchemy.orm import joinedload
+
+from src.databasemodels import Position, Section
+
+position_by_name_query = (
+    select(Position)
+    .options(joinedload(Position.section).load_only(Section.name))
+    .filter(Position.name == bindparam("position_name"))
+)
+
+
+@cache
+def positions_list_query(
+    desc: bool, by_section: bool, after_cursor: bool, by_name: bool
+):
+    query = select(Position).options(
+        joinedload(Position.section).load_only(Section.name)
+    )
+
+    query = (
+        query.order_by(Position.name.desc()) if desc else query.order_by(Position.name)
+    )
+
+    if by_section:
+        query = query.filter(Position.section_id == bindparam("section_id"))
+
+    if after_cursor:
+        last_name = bindparam("last_position_name")
+        query = query.filter(
+            Position.name < last_name if desc else Position.name > last_name
+        )
+
+    if by_name:
+        query = query.filter(Position.name.ilike(bindparam("name_prefix")))
+
+    return query.limit(bindparam("limit", type_=Integer))
+
+
+existing_sections_query = select(Section.id).filter(
+    Section.id.in_(bindparam("ids", expanding=True))
+)
+
+
+def bulk_section_update(changes: list[tuple[str, int]]):
+    # Same shape as user.queries.bulk_position_update: one statement, rows
+    # with a missing section are skipped rather than failing the batch.
+    rows = values(
+        column("name", String), column("section_id", Integer), name="changes"
+    ).data(changes)
+    return (
+        update(Position)
+        .filter(Position.name == rows.c.name, Section.id == rows.c.section_id)
+        .values(section_id=rows.c.section_id)
+        .returning(Position.name)
+    )
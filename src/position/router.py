@@ -1,20 +1,31 @@
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
-from sqlalchemy import insert, select, update, delete
-from sqlalchemy.orm import joinedload
+from sqlalchemy import insert, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from src.services.redis import get_current_superuser, get_current_user
+from src.position.queries import (
+    bulk_section_update,
+    existing_sections_query,
+    position_by_name_query,
+    positions_list_query,
+)
 from src.position.schemas import (
+    BulkSectionChange,
+    BulkSectionResponse,
     MessageResponse,
     PositionCreate,
     PositionPaginationResponse,
     PositionRead,
+    PositionSectionResult,
 )
-from src.databasemodels import Position, Section, User
-from src.database import get_async_session
+from src.databasemodels import Position, User
+from src.database import get_async_session, get_read_session
+from src.services.ratelimit import RateLimiter
+from src.services.cache import ConditionalGet
+from src.services.outbox import record_event
 from src.utils.logger import logger
 
 router = APIRouter(prefix="/position", tags=["position"])
@@ -29,6 +40,9 @@ async def create_new_position(
     try:
         stmt = insert(Position).values(position.model_dump())
         await session.execute(stmt)
+        record_event(
+            session, "position.created", ("position",), {"name": position.name}
+        )
         await session.commit()
 
     except IntegrityError as e:
@@ -71,6 +85,10 @@ async def delete_position(
 ):
     stmt = delete(Position).filter(Position.name == position_name)
     result = await session.execute(stmt)
+    if result.rowcount:
+        record_event(
+            session, "position.deleted", ("position", "user"), {"name": position_name}
+        )
     await session.commit()
 
     if result.rowcount == 0:
@@ -87,6 +105,61 @@ async def delete_position(
     )
 
 
+# Registered before update_position, whose path would otherwise match it.
+@router.patch("/bulk/section", response_model=BulkSectionResponse)
+async def update_positions_sections(
+    user: Annotated[User, Depends(get_current_superuser)],
+    data: BulkSectionChange,
+    session: AsyncSession = Depends(get_async_session),
+):
+    changes = [(item.position_name, item.section_id) for item in data.items]
+    try:
+        result = await session.execute(bulk_section_update(changes))
+        updated = set(result.scalars().all())
+        if updated:
+            record_event(
+                session,
+                "position.bulk_updated",
+                ("position",),
+                {"names": sorted(updated)},
+            )
+        await session.commit()
+    except IntegrityError:
+        # A section was deleted between the join and the foreign key check.
+        await session.rollback()
+        logger.warning(f"{user.email}: Bulk section update hit a removed section")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A section was removed during the update, retry",
+        )
+
+    missing_sections = set()
+    if len(updated) < len(changes):
+        requested = {section_id for _, section_id in changes}
+        result = await session.execute(existing_sections_query, {"ids": requested})
+        missing_sections = requested - set(result.scalars().all())
+
+    items = []
+    for position_name, section_id in changes:
+        if position_name in updated:
+            item_status = "updated"
+        elif section_id in missing_sections:
+            item_status = "section_not_found"
+        else:
+            item_status = "position_not_found"
+        items.append(
+            PositionSectionResult(position_name=position_name, status=item_status)
+        )
+
+    logger.info(
+        f"{user.email}: Bulk section update, {len(updated)} of {len(changes)} positions"
+    )
+    response = BulkSectionResponse(updated=len(updated), items=items)
+    return JSONResponse(
+        content=response.model_dump(mode="json"), status_code=status.HTTP_200_OK
+    )
+
+
 @router.patch("/{position_name}/{section_id}")
 async def update_position(
     user: Annotated[User, Depends(get_current_superuser)],
@@ -101,6 +174,13 @@ async def update_position(
             .values(section_id=section_id)
         )
         result = await session.execute(stmt)
+        if result.rowcount:
+            record_event(
+                session,
+                "position.updated",
+                ("position",),
+                {"name": position_name, "section_id": section_id},
+            )
         await session.commit()
 
     except IntegrityError as e:
@@ -136,18 +216,19 @@ async def update_position(
     )
 
 
-@router.get("/{position_name}", response_model=PositionRead)
+@router.get(
+    "/{position_name}",
+    response_model=PositionRead,
+    dependencies=[Depends(ConditionalGet("position", "section"))],
+)
 async def get_position_by_name(
     user: Annotated[User, Depends(get_current_user)],
     position_name: str,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    query = (
-        select(Position)
-        .options(joinedload(Position.section).load_only(Section.name))
-        .filter(Position.name == position_name)
+    position = await session.execute(
+        position_by_name_query, {"position_name": position_name}
     )
-    position = await session.execute(query)
 
     position = position.scalars().one_or_none()
 
@@ -166,7 +247,14 @@ async def get_position_by_name(
     )
 
 
-@router.get("/list/", response_model=PositionPaginationResponse)
+@router.get(
+    "/list/",
+    response_model=PositionPaginationResponse,
+    dependencies=[
+        Depends(ConditionalGet("position", "section")),
+        Depends(RateLimiter()),
+    ],
+)
 async def get_positions(
     desc: bool = Query(False, description="Тип сортировки"),
     filter_name: Optional[str] = Query(None, description="Должность"),
@@ -176,39 +264,28 @@ async def get_positions(
     ),
     section: Optional[int] = Query(None, description="Отдел"),
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     log = f"{user.email}: Selected positions with params pg_size = {page_size}, desc = {desc}"
 
-    query = select(Position).options(
-        joinedload(Position.section).load_only(Section.name)
-    )
-
-    query = (
-        query.order_by(Position.name.desc()) if desc else query.order_by(Position.name)
+    query = positions_list_query(
+        desc, bool(section), bool(last_position_name), bool(filter_name)
     )
+    params = {"limit": page_size + 1}
 
     if section:
         log += f", section = {section}"
-        query = query.filter(Position.section_id == section)
+        params["section_id"] = section
 
     if last_position_name:
         log += f", last_name = {last_position_name}"
-
-        cursor_filter = (
-            (Position.name < last_position_name)
-            if desc
-            else (Position.name > last_position_name)
-        )
-        query = query.filter(cursor_filter)
+        params["last_position_name"] = last_position_name
 
     if filter_name:
         log += f", filter name = {filter_name}"
-        query = query.filter(Position.name.ilike(f"{filter_name}%"))
-
-    query = query.limit(page_size + 1)
+        params["name_prefix"] = f"{filter_name}%"
 
-    results = await session.execute(query)
+    results = await session.execute(query, params)
     results = results.scalars().all()
     positions = [
         PositionRead(
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from src.config import BULK_UPDATE_MAX_ITEMS
 
 
 class MessageResponse(BaseModel):
@@ -23,3 +26,31 @@ class PositionPaginationResponse(BaseModel):
     last_position_name: str | None
     final: bool
     size: int
+
+
+class PositionSectionChange(BaseModel):
+    position_name: str
+    section_id: int
+
+
+class BulkSectionChange(BaseModel):
+    items: list[PositionSectionChange] = Field(
+        min_length=1, max_length=BULK_UPDATE_MAX_ITEMS
+    )
+
+    @field_validator("items")
+    def check_unique(cls, items):
+        names = [item.position_name for item in items]
+        if len(set(names)) != len(names):
+            raise ValueError("each position can appear only once")
+        return items
+
+
+class PositionSectionResult(BaseModel):
+    position_name: str
+    status: Literal["updated", "position_not_found", "section_not_found"]
+
+
+class BulkSectionResponse(BaseModel):
+    updated: int
+    items: list[PositionSectionResult]
@@ -0,0 +1,31 @@
+from functools import cache
+from sqlalchemy import Integer, bindparam, select
+from sqlalchemy.orm import joinedload
+
+from src.databasemodels import Section, User
+
+section_by_name_query = (
+    select(Section)
+    .options(joinedload(Section.head).load_only(User.email))
+    .filter(Section.name == bindparam("section_name"))
+)
+
+
+@cache
+def sections_list_query(desc: bool, after_cursor: bool, by_name: bool):
+    query = select(Section).options(joinedload(Section.head).load_only(User.email))
+
+    query = (
+        query.order_by(Section.name.desc()) if desc else query.order_by(Section.name)
+    )
+
+    if after_cursor:
+        last_name = bindparam("last_section_name")
+        query = query.filter(
+            Section.name < last_name if desc else Section.name > last_name
+        )
+
+    if by_name:
+        query = query.filter(Section.name.ilike(bindparam("name_prefix")))
+
+    return query.limit(bindparam("limit", type_=Integer))
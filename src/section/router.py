@@ -1,21 +1,25 @@
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
-from sqlalchemy import delete, insert, select, update
-from sqlalchemy.orm import joinedload
+from sqlalchemy import delete, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from src.services.redis import get_current_superuser, get_current_user
 from src.auth.schemas import UserSessionInfo
+from src.section.queries import section_by_name_query, sections_list_query
 from src.section.schemas import (
     MessageResponse,
     SectionCreate,
     SectionPaginationResponse,
     SectionRead,
 )
-from src.databasemodels import Section, User
-from src.database import get_async_session
+from src.databasemodels import Section
+from src.database import get_async_session, get_read_session
+from src.services.ratelimit import RateLimiter
+from src.services.singleflight import single_flight
+from src.services.cache import ConditionalGet
+from src.services.outbox import record_event
 from src.utils.logger import logger
 
 router = APIRouter(prefix="/section", tags=["section"])
@@ -31,6 +35,7 @@ async def create_new_section(
         stmt = insert(Section).values(section.model_dump())
 
         await session.execute(stmt)
+        record_event(session, "section.created", ("section",), {"name": section.name})
         await session.commit()
 
     except IntegrityError as e:
@@ -77,6 +82,10 @@ async def delete_section(
 
     stmt = delete(Section).filter(Section.name == section_name)
     result = await session.execute(stmt)
+    if result.rowcount:
+        record_event(
+            session, "section.deleted", ("section", "position"), {"name": section_name}
+        )
     await session.commit()
 
     if result.rowcount == 0:
@@ -106,6 +115,13 @@ async def update_section(
             update(Section).filter(Section.name == section_name).values(head_id=head_id)
         )
         result = await session.execute(stmt)
+        if result.rowcount:
+            record_event(
+                session,
+                "section.updated",
+                ("section",),
+                {"name": section_name, "head_id": head_id},
+            )
         await session.commit()
 
     except IntegrityError as e:
@@ -140,18 +156,20 @@ async def update_section(
     )
 
 
-@router.get("/{section_name}", response_model=SectionRead)
+@router.get(
+    "/{section_name}",
+    response_model=SectionRead,
+    dependencies=[Depends(ConditionalGet("section", "user"))],
+)
+@single_flight
 async def get_section_by_name(
     user: Annotated[UserSessionInfo, Depends(get_current_user)],
     section_name: str,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    query = (
-        select(Section)
-        .options(joinedload(Section.head).load_only(User.email))
-        .filter(Section.name == section_name)
+    section = await session.execute(
+        section_by_name_query, {"section_name": section_name}
     )
-    section = await session.execute(query)
 
     section = section.scalars().one_or_none()
 
@@ -172,7 +190,14 @@ async def get_section_by_name(
     )
 
 
-@router.get("/list/", response_model=SectionPaginationResponse)
+@router.get(
+    "/list/",
+    response_model=SectionPaginationResponse,
+    dependencies=[
+        Depends(ConditionalGet("section", "user")),
+        Depends(RateLimiter()),
+    ],
+)
 async def get_sections(
     desc: bool = Query(False, description="Тип сортировки"),
     filter_name: Optional[str] = Query(None, description="Отдел"),
@@ -181,34 +206,22 @@ async def get_sections(
         None, description="Последний на предыдущей странице"
     ),
     user: UserSessionInfo = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     log = f"{user.email}: Selected sections with params pg_size = {page_size}, desc = {desc}"
 
-    query = select(Section).options(joinedload(Section.head).load_only(User.email))
-
-    query = (
-        query.order_by(Section.name.desc()) if desc else query.order_by(Section.name)
-    )
+    query = sections_list_query(desc, bool(last_section_name), bool(filter_name))
+    params = {"limit": page_size + 1}
 
     if last_section_name:
         log += f", last_name = {last_section_name}"
-
-        cursor_filter = (
-            (Section.name < last_section_name)
-            if desc
-            else (Section.name > last_section_name)
-        )
-        query = query.filter(cursor_filter)
+        params["last_section_name"] = last_section_name
 
     if filter_name:
         log += f", filter name = {filter_name}"
+        params["name_prefix"] = f"{filter_name}%"
 
-        query = query.filter(Section.name.ilike(f"{filter_name}%"))
-
-    query = query.limit(page_size + 1)
-
-    results = await session.execute(query)
+    results = await session.execute(query, params)
     results = results.scalars().all()
     sections = [
         SectionRead(
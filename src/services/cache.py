@@ -0,0 +1,176 @@
+import hashlib
+from collections import OrderedDict
+from datetime import date
+from urllib.parse import urlencode
+from fastapi import Depends, HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.auth.schemas import UserSessionInfo
+from src.config import COMPRESSION_MIN_SIZE
+from src.database import get_read_session_maker, reads_replica
+from src.services import redis as redis_service
+from src.services.redis import get_current_user
+from src.utils.compression import (
+    choose_encoding,
+    compress,
+    decoded_etag,
+    encoded_etag,
+)
+from src.utils.logger import logger
+
+
+def generation_key(table: str) -> str:
+    return f"generation:{table}"
+
+
+async def bump_generations(*tables: str) -> dict[str, int]:
+    """Increment the generations of tables; raises RedisError so the outbox
+    dispatcher can retry the event."""
+    async with redis_service.redis_client.pipeline(transaction=False) as pipe:
+        for table in tables:
+            pipe.incr(generation_key(table))
+        values = await pipe.execute()
+    return dict(zip(tables, values))
+
+
+class GenerationMirror:
+    """Worker-local copy of table generations, trusted only while the outbox
+    subscriber is connected."""
+
+    def __init__(self):
+        self.values: dict[str, int] = {}
+        self.live = False
+
+    def get(self, tables: tuple[str, ...]) -> tuple[int, ...] | None:
+        if not self.live or not all(table in self.values for table in tables):
+            return None
+        return tuple(self.values[table] for table in tables)
+
+    def update(self, generations: dict[str, int]):
+        for table, generation in generations.items():
+            self.values[table] = max(self.values.get(table, 0), generation)
+
+    def set_live(self, live: bool):
+        self.live = live
+        self.values.clear()
+
+
+generation_mirror = GenerationMirror()
+
+
+async def get_generations(*tables: str) -> tuple[int, ...] | None:
+    """Current generation of each table, or None when Redis is unavailable
+    and nothing derived from them may be cached."""
+    generations = generation_mirror.get(tables)
+    if generations is not None:
+        return generations
+
+    try:
+        values = await redis_service.redis_client.mget(
+            [generation_key(table) for table in tables]
+        )
+    except RedisError as e:
+        logger.warning(f"Failed to read generations of {tables}: {e}")
+        return None
+    generations = tuple(int(value or 0) for value in values)
+    if generation_mirror.live:
+        generation_mirror.update(dict(zip(tables, generations)))
+    return generations
+
+
+class CachedResponse:
+    """Serialized body plus its compressed variants, built on first request
+    for each encoding so repeat hits skip the compression middleware."""
+
+    def __init__(self, body: bytes, etag: str | None):
+        self.body = body
+        self.etag = etag
+        self.encoded: dict[str, bytes] = {}
+
+    def for_request(self, request: Request) -> tuple[bytes, dict[str, str]]:
+        headers = {"ETag": self.etag} if self.etag else {}
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding is None or len(self.body) < COMPRESSION_MIN_SIZE:
+            return self.body, headers
+
+        if encoding not in self.encoded:
+            self.encoded[encoding] = compress(self.body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+        if self.etag:
+            headers["ETag"] = encoded_etag(self.etag, encoding)
+        return self.encoded[encoding], headers
+
+
+class ResponseCache:
+    """Per-worker LRU of serialized responses keyed by table generations."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key) -> CachedResponse | None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key, entry: CachedResponse):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def etag_matches(request: Request, etag: str | None) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    # A tag handed out with a compressed body still names the same content.
+    candidates = {
+        decoded_etag(tag.strip().removeprefix("W/")) for tag in header.split(",")
+    }
+    return etag in candidates or "*" in candidates
+
+
+class ConditionalGet:
+    """ETag from the generations of the tables a GET reads, so If-None-Match
+    is answered before the handler queries. daily adds today's date."""
+
+    def __init__(self, *tables: str, daily: bool = False):
+        self.tables = tables
+        self.daily = daily
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        user: UserSessionInfo = Depends(get_current_user),
+        session_maker: async_sessionmaker = Depends(get_read_session_maker),
+    ):
+        generations = await get_generations(*self.tables)
+        if generations is None:
+            return None
+
+        query = urlencode(sorted(request.query_params.multi_items()))
+        parts = [request.url.path, query, *generations]
+        if self.daily:
+            parts.append(date.today().isoformat())
+        digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8"))
+        etag = f'"{digest.hexdigest()}"'
+        # single_flight keys on it, so a flight never spans a generation bump.
+        request.state.etag = etag
+
+        if etag_matches(request, etag):
+            logger.info(f"{user.email}: Not modified {request.url.path}")
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        # A lagging replica would tag pre-write rows with the new generation.
+        if not reads_replica(session_maker):
+            response.headers["ETag"] = etag
@@ -0,0 +1,91 @@
+"""Fan-out of outbox events to Server-Sent Events clients. A client that
+falls CHANGE_FEED_BUFFER events behind is dropped and reconnects."""
+
+import asyncio
+import json
+
+from src.config import CHANGE_FEED_BUFFER, CHANGE_FEED_MAX_CLIENTS
+
+FEED_TABLES = ("user", "vacation", "section", "position")
+
+# Control messages ending a stream or asking clients to refetch everything.
+DROPPED = {"event": "dropped"}
+CLOSED = {"event": "closed"}
+RESYNC = {"event": "resync"}
+
+
+def event_topics(tables: list[str]) -> set[str]:
+    # Month tables like "vacation:2026-10" belong to the vacation topic.
+    return {table.split(":", 1)[0] for table in tables}
+
+
+class Subscriber:
+    def __init__(self, topics: set[str], buffer: int = CHANGE_FEED_BUFFER):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+
+    def wants(self, message: dict) -> bool:
+        return bool(self.topics & event_topics(message["tables"]))
+
+    def offer(self, message: dict) -> bool:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def end(self, message: dict):
+        # Make room so the final message is delivered before anything else.
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class ChangeFeed:
+    def __init__(self, max_clients: int = CHANGE_FEED_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self.subscribers: set[Subscriber] = set()
+        self.closed = False
+
+    def subscribe(self, topics: set[str]) -> Subscriber | None:
+        if self.closed or len(self.subscribers) >= self.max_clients:
+            return None
+        subscriber = Subscriber(topics)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, message: dict):
+        for subscriber in list(self.subscribers):
+            if subscriber.wants(message) and not subscriber.offer(message):
+                subscriber.end(DROPPED)
+                self.unsubscribe(subscriber)
+
+    def resync(self):
+        """Events may have been missed while pub/sub was down."""
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(RESYNC):
+                subscriber.end(DROPPED)
+                self.unsubscribe(subscriber)
+
+    def close(self):
+        self.closed = True
+        for subscriber in self.subscribers:
+            subscriber.end(CLOSED)
+        self.subscribers.clear()
+
+
+change_feed = ChangeFeed()
+
+
+def format_event(message: dict) -> str:
+    lines = []
+    # Clients send the publish number back as Last-Event-ID.
+    if "seq" in message:
+        lines.append(f"id: {message['seq']}")
+    lines.append(f"event: {message['event']}")
+    data = {key: message[key] for key in ("tables", "payload") if key in message}
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
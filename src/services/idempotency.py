@@ -0,0 +1,183 @@
+import asyncio
+import base64
+import hashlib
+import json
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+
+from src.config import IDEMPOTENCY_LOCK_TTL, IDEMPOTENCY_TTL, IDEMPOTENCY_WAIT
+from src.services import redis as redis_service
+from src.utils.logger import logger
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+POLL_INTERVAL = 0.1
+
+
+def idempotency_key(scope, headers: Headers, key: str) -> str:
+    # Keys are only unique per client, so scope them by session (or address
+    # for anonymous calls) to keep one client from replaying another's.
+    owner = cookie_parser(headers.get("cookie", "")).get("authcook")
+    if owner is None and scope.get("client"):
+        owner = scope["client"][0]
+    owner_hash = hashlib.sha256(str(owner).encode("utf-8")).hexdigest()[:16]
+    return f"idempotency:{owner_hash}:{key}"
+
+
+def fingerprint(scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"], scope["path"], scope.get("query_string", b"")):
+        digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+async def send_json(send, status_code: int, detail: str, headers=()):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def replay(send, stored: dict):
+    headers = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in stored["headers"]
+    ]
+    await send(
+        {
+            "type": "http.response.start",
+            "status": stored["status"],
+            "headers": [*headers, (REPLAYED_HEADER, b"true")],
+        }
+    )
+    await send({"type": "http.response.body", "body": base64.b64decode(stored["body"])})
+
+
+async def wait_for_result(key: str) -> dict | None:
+    """Poll while a concurrent identical request is still running."""
+    deadline = asyncio.get_running_loop().time() + IDEMPOTENCY_WAIT
+    while True:
+        raw = await redis_service.redis_client.get(key)
+        if raw is None:
+            return None
+        stored = json.loads(raw)
+        if stored.get("status") is not None:
+            return stored
+        if asyncio.get_running_loop().time() >= deadline:
+            return stored
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+class IdempotencyMiddleware:
+    """Replays the stored response for a repeated Idempotency-Key; retries
+    arriving meanwhile wait for the first request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        client_key = headers.get(IDEMPOTENCY_HEADER)
+        if not client_key:
+            return await self.app(scope, receive, send)
+
+        body = await read_body(receive)
+        body_sent = False
+
+        async def receive_replay():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        key = idempotency_key(scope, headers, client_key)
+        request_fingerprint = fingerprint(scope, body)
+        lock_value = json.dumps({"fingerprint": request_fingerprint})
+
+        try:
+            acquired = await redis_service.redis_client.set(
+                key, lock_value, nx=True, ex=IDEMPOTENCY_LOCK_TTL
+            )
+            stored = None if acquired else await wait_for_result(key)
+        except RedisError as e:
+            logger.warning(f"Idempotency check failed for {scope['path']}: {e}")
+            return await self.app(scope, receive_replay, send)
+
+        if not acquired and stored is not None:
+            if stored["fingerprint"] != request_fingerprint:
+                return await send_json(
+                    send, 422, "Idempotency-Key reused with a different request"
+                )
+            if stored.get("status") is None:
+                return await send_json(
+                    send,
+                    409,
+                    "A request with this Idempotency-Key is in progress",
+                    [(b"retry-after", b"1")],
+                )
+            logger.info(f"Replayed {scope['method']} {scope['path']}")
+            return await replay(send, stored)
+
+        response = {"status": None, "headers": [], "body": b""}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"set-cookie"
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+            await send(message)
+
+        completed = False
+        try:
+            await self.app(scope, receive_replay, send_wrapper)
+            completed = response["status"] is not None and response["status"] < 500
+        finally:
+            await self.store(key, request_fingerprint, response, completed)
+
+    async def store(self, key: str, request_fingerprint: str, response, completed):
+        try:
+            if not completed:
+                await redis_service.redis_client.delete(key)
+                return
+            stored = {
+                "fingerprint": request_fingerprint,
+                "status": response["status"],
+                "headers": response["headers"],
+                "body": base64.b64encode(response["body"]).decode("ascii"),
+            }
+            await redis_service.redis_client.set(
+                key, json.dumps(stored), ex=IDEMPOTENCY_TTL
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to store idempotent response {key}: {e}")
@@ -0,0 +1,223 @@
+"""Redis-backed queue for heavy superuser operations. Standalone worker:
+
+python -m src.services.jobs
+"""
+
+import asyncio
+import importlib
+import json
+import time
+import traceback
+import uuid
+from typing import Awaitable, Callable
+from redis.exceptions import RedisError
+
+from src.config import (
+    JOB_CONCURRENCY,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY,
+    JOB_TIMEOUT,
+    JOB_TTL,
+    SHUTDOWN_DRAIN_TIMEOUT,
+)
+from src.services import redis as redis_service
+from src.utils.logger import logger
+
+QUEUE_KEY = "jobs:queue"
+RUNNING_KEY = "jobs:running"
+DELAYED_KEY = "jobs:delayed"
+POLL_INTERVAL = 0.5
+
+# Pops a job and leases it in one step, so a worker dying in between can't
+# leave it queued in status but in neither the queue nor the running set.
+CLAIM_SCRIPT = """
+local job_id = redis.call('RPOP', KEYS[1])
+if job_id then
+    redis.call('ZADD', KEYS[2], ARGV[1], job_id)
+end
+return job_id
+"""
+
+# Modules whose handlers the worker needs; imported on worker start so a
+# standalone worker doesn't have to load the whole app.
+JOB_MODULES = ("src.user.jobs",)
+
+JobHandler = Callable[[dict], Awaitable[dict | None]]
+job_handlers: dict[str, JobHandler] = {}
+
+
+def job(name: str):
+    def register(handler: JobHandler) -> JobHandler:
+        job_handlers[name] = handler
+        return handler
+
+    return register
+
+
+def job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+async def enqueue(name: str, payload: dict, requested_by: str) -> str:
+    job_id = str(uuid.uuid4())
+    async with redis_service.redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(
+            job_key(job_id),
+            mapping={
+                "name": name,
+                "payload": json.dumps(payload),
+                "status": "queued",
+                "attempts": 0,
+                "requested_by": requested_by,
+                "created_at": time.time(),
+            },
+        )
+        pipe.expire(job_key(job_id), JOB_TTL)
+        pipe.lpush(QUEUE_KEY, job_id)
+        await pipe.execute()
+    return job_id
+
+
+async def get_job(job_id: str) -> dict | None:
+    data = await redis_service.redis_client.hgetall(job_key(job_id))
+    return data or None
+
+
+async def finish(job_id: str, fields: dict):
+    async with redis_service.redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), mapping={**fields, "finished_at": time.time()})
+        pipe.zrem(RUNNING_KEY, job_id)
+        await pipe.execute()
+
+
+async def retry_or_fail(job_id: str, attempts: int, error: str):
+    if attempts < JOB_MAX_ATTEMPTS:
+        # Exponential backoff; the job waits in the delayed set until due.
+        ready_at = time.time() + JOB_RETRY_DELAY * 2 ** (attempts - 1)
+        async with redis_service.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key(job_id), mapping={"status": "retrying", "error": error})
+            pipe.zrem(RUNNING_KEY, job_id)
+            pipe.zadd(DELAYED_KEY, {job_id: ready_at})
+            await pipe.execute()
+        return
+    await finish(job_id, {"status": "failed", "error": error})
+
+
+async def run_job(job_id: str):
+    client = redis_service.redis_client
+    data = await client.hgetall(job_key(job_id))
+    if not data:
+        await client.zrem(RUNNING_KEY, job_id)
+        return
+
+    attempts = int(data["attempts"]) + 1
+    await client.hset(
+        job_key(job_id),
+        mapping={"status": "running", "attempts": attempts, "started_at": time.time()},
+    )
+    handler = job_handlers.get(data["name"])
+    if handler is None:
+        await finish(job_id, {"status": "failed", "error": "Unknown job"})
+        return
+
+    try:
+        result = await asyncio.wait_for(
+            handler(json.loads(data["payload"])), JOB_TIMEOUT
+        )
+    except Exception as e:
+        logger.warning(f"Job {data['name']} {job_id} failed: {e!r}")
+        await retry_or_fail(
+            job_id, attempts, traceback.format_exception_only(e)[-1].strip()
+        )
+        return
+
+    await finish(job_id, {"status": "succeeded", "result": json.dumps(result)})
+    logger.info(f"Job {data['name']} {job_id} succeeded for {data['requested_by']}")
+
+
+async def claim_job() -> str | None:
+    # Lease: if this worker dies, the job is requeued once it expires.
+    return await redis_service.redis_client.eval(
+        CLAIM_SCRIPT, 2, QUEUE_KEY, RUNNING_KEY, time.time() + JOB_TIMEOUT * 2
+    )
+
+
+async def requeue(job_id: str):
+    async with redis_service.redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(job_key(job_id), "status", "queued")
+        pipe.zrem(RUNNING_KEY, job_id)
+        pipe.rpush(QUEUE_KEY, job_id)
+        await pipe.execute()
+
+
+async def promote_due_jobs():
+    """Move due retries to the queue and requeue jobs whose worker died."""
+    client = redis_service.redis_client
+    now = time.time()
+    for source in (DELAYED_KEY, RUNNING_KEY):
+        for job_id in await client.zrangebyscore(source, 0, now):
+            # zrem is the claim: only the worker that removes it requeues it.
+            if await client.zrem(source, job_id):
+                await client.lpush(QUEUE_KEY, job_id)
+
+
+async def stop_jobs(tasks: set[asyncio.Task], timeout: float):
+    """Let running jobs finish within timeout and requeue the rest, before
+    the engine and Redis client are closed."""
+    if not tasks:
+        return None
+    logger.info(f"Job worker stopping with {len(tasks)} jobs running")
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_worker(
+    concurrency: int = JOB_CONCURRENCY, stop_timeout: float = SHUTDOWN_DRAIN_TIMEOUT
+):
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+
+    slots = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
+
+    async def run_in_slot(job_id: str):
+        try:
+            await run_job(job_id)
+        except asyncio.CancelledError:
+            # At the front of the queue, for the next worker to pick up.
+            await requeue(job_id)
+            raise
+        except RedisError as e:
+            logger.warning(f"Job {job_id} lost its status update: {e}")
+        finally:
+            slots.release()
+
+    try:
+        while True:
+            await slots.acquire()
+            try:
+                await promote_due_jobs()
+                job_id = await claim_job()
+            except RedisError as e:
+                slots.release()
+                logger.warning(f"Job worker lost Redis: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if job_id is None:
+                slots.release()
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+
+            task = asyncio.create_task(run_in_slot(job_id))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except asyncio.CancelledError:
+        await stop_jobs(tasks, stop_timeout)
+        raise
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
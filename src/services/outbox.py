@@ -0,0 +1,152 @@
+"""Transactional outbox: events recorded with each change are published to
+every worker, which bumps its cache generations."""
+
+import asyncio
+import json
+from datetime import timedelta
+from redis.exceptions import RedisError
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import OUTBOX_BATCH_SIZE, OUTBOX_POLL_INTERVAL, OUTBOX_RETENTION_DAYS
+from src.database import async_session_maker
+from src.databasemodels import OutboxEvent, outbox_publish_seq
+from src.services import redis as redis_service
+from src.services.cache import bump_generations, generation_mirror
+from src.services.changefeed import change_feed
+from src.utils.logger import logger
+
+OUTBOX_CHANNEL = "outbox"
+# Advisory lock key held by the worker currently dispatching.
+OUTBOX_DISPATCH_LOCK = 0x6F7574626F78
+RECONNECT_DELAY = 1
+
+outbox_wakeup = asyncio.Event()
+
+
+def record_event(
+    session: AsyncSession, name: str, tables: tuple[str, ...], payload=None
+):
+    session.add(OutboxEvent(event=name, tables=list(tables), payload=payload))
+    session.info["outbox"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def wake_dispatcher(session: Session):
+    if session.info.pop("outbox", False):
+        outbox_wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_events(session: Session):
+    session.info.pop("outbox", None)
+
+
+async def dispatch_pending(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    async with async_session_maker() as session:
+        # One dispatcher at a time, so events are numbered, published and
+        # committed in the same order and the change feed can replay by
+        # published_seq. The others skip the pass and retry on their next poll.
+        locked = await session.scalar(
+            select(func.pg_try_advisory_xact_lock(OUTBOX_DISPATCH_LOCK))
+        )
+        if not locked:
+            return 0
+
+        query = (
+            select(OutboxEvent)
+            .filter(OutboxEvent.published_at.is_(None))
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+        )
+        events = (await session.execute(query)).scalars().all()
+        if not events:
+            return 0
+
+        for outbox_event in events:
+            generations = await bump_generations(*outbox_event.tables)
+            seq = await session.scalar(select(outbox_publish_seq.next_value()))
+            message = {
+                "id": outbox_event.id,
+                "seq": seq,
+                "event": outbox_event.event,
+                "tables": outbox_event.tables,
+                "payload": outbox_event.payload,
+                "generations": generations,
+            }
+            await redis_service.redis_client.publish(
+                OUTBOX_CHANNEL, json.dumps(message)
+            )
+            outbox_event.published_seq = seq
+            outbox_event.published_at = func.now()
+
+        await session.commit()
+        return len(events)
+
+
+async def prune_published(days: int = OUTBOX_RETENTION_DAYS):
+    async with async_session_maker() as session:
+        stmt = delete(OutboxEvent).filter(
+            OutboxEvent.published_at < func.now() - timedelta(days=days)
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+
+async def run_dispatcher():
+    try:
+        await prune_published()
+    except (OSError, SQLAlchemyError) as e:
+        logger.warning(f"Failed to prune outbox: {e}")
+
+    while True:
+        try:
+            await asyncio.wait_for(outbox_wakeup.wait(), OUTBOX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        outbox_wakeup.clear()
+
+        try:
+            while await dispatch_pending() == OUTBOX_BATCH_SIZE:
+                pass
+        except (OSError, RedisError, SQLAlchemyError) as e:
+            # Unpublished events stay in the table and go out on a later pass.
+            logger.warning(f"Outbox dispatch failed: {e}")
+
+
+async def run_subscriber():
+    reconnecting = False
+    while True:
+        pubsub = redis_service.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(OUTBOX_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    # Only from the confirmation on is every bump delivered;
+                    # going live earlier could miss one and stay stale.
+                    generation_mirror.set_live(True)
+                    if reconnecting:
+                        change_feed.resync()
+                    continue
+                if message["type"] != "message":
+                    continue
+                outbox_event = json.loads(message["data"])
+                generation_mirror.update(outbox_event["generations"])
+                change_feed.publish(outbox_event)
+        except (OSError, RedisError) as e:
+            logger.warning(f"Outbox subscriber disconnected: {e}")
+        finally:
+            # Bumps may be missed while disconnected, so stop trusting the mirror.
+            generation_mirror.set_live(False)
+            await pubsub.aclose()
+        reconnecting = True
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+def start_outbox() -> list[asyncio.Task]:
+    return [
+        asyncio.create_task(run_dispatcher()),
+        asyncio.create_task(run_subscriber()),
+    ]
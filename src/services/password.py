@@ -0,0 +1,94 @@
+import hashlib
+import hmac
+from pwdlib import PasswordHash
+from pwdlib.exceptions import UnknownHashError
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from src.config import (
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    ARGON2_TIME_COST,
+    DUMMY_HASH_KEY,
+)
+from src.database import async_session_maker
+from src.databasemodels import User
+from src.utils.logger import logger
+
+# The first hasher hashes new passwords; the rest only verify existing
+# hashes, which get replaced on the next successful login.
+password_hash = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=ARGON2_TIME_COST,
+            memory_cost=ARGON2_MEMORY_COST,
+            parallelism=ARGON2_PARALLELISM,
+        ),
+        BcryptHasher(),
+    )
+)
+
+
+legacy_hashes_query = select(
+    func.count(),
+    func.count().filter(User.hashed_password.like("$2%")),
+).select_from(User)
+
+
+def hash_password(password: str) -> str:
+    return password_hash.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Whether the password matches, and a new hash if the stored one uses a
+    legacy hasher or outdated cost parameters."""
+    try:
+        return password_hash.verify_and_update(password, hashed_password)
+    except UnknownHashError:
+        return False, None
+
+
+# Hashing takes tens of milliseconds of CPU, so request handlers run it in
+# the threadpool instead of blocking the event loop.
+async def hash_password_async(password: str) -> str:
+    return await run_in_threadpool(hash_password, password)
+
+
+async def verify_password_async(
+    password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await run_in_threadpool(verify_password, password, hashed_password)
+
+
+class DummyHashes:
+    """Hashes verified for unknown emails, so a miss costs what a hit does;
+    argon2 or bcrypt per email, in the share of the stored hashes."""
+
+    def __init__(self):
+        self.argon2: str | None = None
+        self.bcrypt: str | None = None
+        self.legacy_share = 0.0
+
+    def build(self):
+        self.argon2 = hash_password("dummy-password")
+        self.bcrypt = BcryptHasher().hash("dummy-password")
+
+    async def prepare(self):
+        # Called at startup; hashing happens in the threadpool either way.
+        await run_in_threadpool(self.build)
+        async with async_session_maker() as session:
+            total, legacy = (await session.execute(legacy_hashes_query)).one()
+        self.legacy_share = legacy / total if total else 0.0
+        logger.info(f"Legacy password hashes: {legacy} of {total}")
+
+    async def for_email(self, email: str) -> str:
+        if self.argon2 is None:
+            await run_in_threadpool(self.build)
+        digest = hmac.new(DUMMY_HASH_KEY.encode(), email.encode(), hashlib.sha256)
+        position = int.from_bytes(digest.digest()[:8], "big") / 2**64
+        return self.bcrypt if position < self.legacy_share else self.argon2
+
+
+dummy_hashes = DummyHashes()
@@ -0,0 +1,212 @@
+import math
+import time
+import uuid
+from typing import Callable
+from fastapi import Depends, HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+
+from src.auth.schemas import UserSessionInfo
+from src.config import (
+    LOGIN_EMAIL_LIMIT,
+    LOGIN_IP_LIMIT,
+    LOGIN_RATE_WINDOW,
+    RATE_LIMIT_CAPACITY,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_REFILL_RATE,
+    UNKNOWN_EMAIL_TTL,
+)
+from src.services import redis as redis_service
+from src.services.redis import get_current_user
+from src.utils.logger import logger
+
+# KEYS: ip window, email window, unknown email marker
+# ARGV: now (ms), window (ms), ip limit, email limit, attempt id
+# Returns {retry_after_ms, 0} when limited, {0, is_unknown_email} otherwise.
+LOGIN_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limits = {tonumber(ARGV[3]), tonumber(ARGV[4])}
+local retry = 0
+for i = 1, 2 do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], 0, now - window)
+    if redis.call('ZCARD', KEYS[i]) >= limits[i] then
+        local oldest = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+        retry = math.max(retry, tonumber(oldest[2]) + window - now)
+    end
+end
+if retry > 0 then
+    return {retry, 0}
+end
+for i = 1, 2 do
+    redis.call('ZADD', KEYS[i], now, ARGV[5])
+    redis.call('PEXPIRE', KEYS[i], window)
+end
+return {0, redis.call('EXISTS', KEYS[3])}
+"""
+
+login_limit_script = redis_service.redis_client.register_script(LOGIN_LIMIT_SCRIPT)
+
+
+def login_keys(ip: str, email: str) -> list[str]:
+    # Attempts are counted case-insensitively so case variants share a window,
+    # but the unknown marker uses the exact string the user lookup matches:
+    # a miss for ROOT@example.com says nothing about root@example.com.
+    return [
+        f"login:ip:{ip}",
+        f"login:email:{email.lower()}",
+        f"login:unknown:{email}",
+    ]
+
+
+async def check_login_attempt(ip: str, email: str) -> tuple[str | None, bool]:
+    attempt = uuid.uuid4().hex
+    try:
+        retry_after, is_unknown = await login_limit_script(
+            keys=login_keys(ip, email),
+            args=[
+                int(time.time() * 1000),
+                LOGIN_RATE_WINDOW * 1000,
+                LOGIN_IP_LIMIT,
+                LOGIN_EMAIL_LIMIT,
+                attempt,
+            ],
+            client=redis_service.redis_client,
+        )
+    except RedisError as e:
+        logger.warning(f"Login limiter unavailable, skipping check: {e}")
+        return None, False
+
+    if retry_after:
+        logger.warning(f"Login rate limit exceeded for {email} from {ip}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(int(retry_after) / 1000))},
+        )
+
+    return attempt, bool(is_unknown)
+
+
+async def forget_login_attempt(ip: str, email: str, attempt: str | None):
+    if attempt is None:
+        return None
+
+    ip_key, email_key, _ = login_keys(ip, email)
+    async with redis_service.redis_client.pipeline(transaction=False) as pipe:
+        pipe.zrem(ip_key, attempt)
+        pipe.zrem(email_key, attempt)
+        await pipe.execute()
+
+
+async def remember_unknown_email(email: str):
+    *_, unknown_key = login_keys("", email)
+    await redis_service.redis_client.setex(unknown_key, UNKNOWN_EMAIL_TTL, 1)
+
+
+async def forget_unknown_email(email: str):
+    *_, unknown_key = login_keys("", email)
+    await redis_service.redis_client.delete(unknown_key)
+
+
+# KEYS: bucket
+# ARGV: capacity, refill rate (tokens per second), now (ms), cost
+# Returns {allowed, tokens left}; tokens are returned as a string because
+# Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) / 1000 * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+token_bucket_script = redis_service.redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+
+LOCAL_BUCKETS_LIMIT = 10000
+local_buckets: dict[str, tuple[float, float]] = {}
+
+
+def take_local_tokens(key: str, cost: int) -> tuple[bool, float]:
+    now = time.monotonic()
+    if len(local_buckets) > LOCAL_BUCKETS_LIMIT:
+        local_buckets.clear()
+
+    tokens, ts = local_buckets.get(key, (RATE_LIMIT_CAPACITY, now))
+    tokens = min(RATE_LIMIT_CAPACITY, tokens + (now - ts) * RATE_LIMIT_REFILL_RATE)
+    allowed = tokens >= cost
+    if allowed:
+        tokens -= cost
+    local_buckets[key] = (tokens, now)
+    return allowed, tokens
+
+
+async def take_tokens(key: str, cost: int) -> tuple[bool, float]:
+    try:
+        allowed, tokens = await token_bucket_script(
+            keys=[key],
+            args=[
+                RATE_LIMIT_CAPACITY,
+                RATE_LIMIT_REFILL_RATE,
+                int(time.time() * 1000),
+                cost,
+            ],
+            client=redis_service.redis_client,
+        )
+    except RedisError as e:
+        logger.warning(f"Rate limiter falls back to local bucket: {e}")
+        return take_local_tokens(key, cost)
+
+    return bool(allowed), float(tokens)
+
+
+def rate_limit_headers(tokens: float) -> dict[str, str]:
+    reset = (RATE_LIMIT_CAPACITY - tokens) / RATE_LIMIT_REFILL_RATE
+    return {
+        "RateLimit-Limit": str(RATE_LIMIT_CAPACITY),
+        "RateLimit-Remaining": str(math.floor(tokens)),
+        "RateLimit-Reset": str(math.ceil(reset)),
+    }
+
+
+class RateLimiter:
+    """Token bucket per user and route; cost may be a callable of the request."""
+
+    def __init__(self, cost: int | Callable[[Request], int] = 1):
+        self.cost = cost
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        user: UserSessionInfo = Depends(get_current_user),
+    ):
+        if not RATE_LIMIT_ENABLED:
+            return None
+
+        cost = self.cost(request) if callable(self.cost) else self.cost
+        key = f"ratelimit:{user.id}:{request.scope['route'].path}"
+        allowed, tokens = await take_tokens(key, cost)
+
+        headers = rate_limit_headers(tokens)
+        if not allowed:
+            retry_after = (cost - tokens) / RATE_LIMIT_REFILL_RATE
+            headers["Retry-After"] = str(math.ceil(retry_after))
+            logger.warning(f"{user.email}: Rate limit exceeded on {key}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers=headers,
+            )
+
+        response.headers.update(headers)
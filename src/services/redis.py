@@ -1,16 +1,67 @@
-from fastapi import HTTPException, Request, status
+import time
+from fastapi import HTTPException, Request, Response, status
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 import uuid
 import json
 
 from src.auth.schemas import UserSessionInfo
-from src.config import REDIS_HOST, REDIS_PORT
+from src.config import ACCESS_TOKEN_TTL, AUTH_MODE, REDIS_HOST, REDIS_PORT
+from src.services.token import (
+    ACCESS_COOKIE,
+    create_access_token,
+    decode_access_token,
+    revocation_list,
+    token_user_info,
+)
 from src.utils.logger import logger
 
 redis_client = Redis(host=REDIS_HOST, port=REDIS_PORT, db=0, decode_responses=True)
 
 SESSION_TTL = 1800
 
+REVOKED_USERS_KEY = "revoked:users"
+REVOKED_SESSIONS_KEY = "revoked:sessions"
+
+
+async def revoke_access_tokens(user_id: int, session_uuid: str | None = None):
+    if AUTH_MODE != "token":
+        return None
+
+    now = time.time()
+    key, member = (
+        (REVOKED_USERS_KEY, str(user_id))
+        if session_uuid is None
+        else (REVOKED_SESSIONS_KEY, session_uuid)
+    )
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.zadd(key, {member: now})
+        pipe.zremrangebyscore(key, 0, now - ACCESS_TOKEN_TTL)
+        pipe.expire(key, ACCESS_TOKEN_TTL)
+        await pipe.execute()
+
+    revocation_list.add(user_id, session_uuid, now)
+    logger.info(f"Revoked access tokens of user {user_id}, session = {session_uuid}")
+
+
+async def sync_revocation_list():
+    if not revocation_list.is_stale():
+        return None
+
+    min_score = time.time() - ACCESS_TOKEN_TTL
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(REVOKED_USERS_KEY, min_score, "+inf", withscores=True)
+            pipe.zrangebyscore(REVOKED_SESSIONS_KEY, min_score, "+inf", withscores=True)
+            users, sessions = await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Revocation list sync failed: {e}")
+        return None
+
+    revocation_list.update(
+        {int(user_id): score for user_id, score in users}, dict(sessions)
+    )
+
 
 async def remove_session(session_key):
 
@@ -23,6 +74,7 @@ async def remove_session(session_key):
         logger.warning(f"Session {session_key} does not exists")
         return None
     user_id, session_uuid = session_key.split(":")
+    await revoke_access_tokens(int(user_id), session_uuid)
 
     user_sessions_key = f"user_sessions:{user_id}"
     if await redis_client.srem(user_sessions_key, session_uuid):
@@ -49,6 +101,8 @@ async def remove_all_user_session(user_id: int):
         await redis_client.delete(user_sessions_key)
         logger.info(f"Deleted sessions of user {user_id}")
 
+    await revoke_access_tokens(user_id)
+
 
 async def create_session(user_id: int, email: str, is_superuser: bool):
     session_uuid = str(uuid.uuid4())
@@ -62,7 +116,7 @@ async def create_session(user_id: int, email: str, is_superuser: bool):
     return f"{user_id}:{session_uuid}"
 
 
-async def get_user_info(request: Request) -> UserSessionInfo:
+async def load_session(request: Request) -> tuple[UserSessionInfo, str]:
     session = request.cookies.get("authcook")
     if not session:
         raise HTTPException(
@@ -87,19 +141,65 @@ async def get_user_info(request: Request) -> UserSessionInfo:
     await redis_client.expire(session_key, SESSION_TTL)
 
     data = json.loads(session_data)
-    return UserSessionInfo(
+    user = UserSessionInfo(
         id=int(user_id),
         email=data["email"],
         is_superuser=data["is_superuser"],
     )
+    return user, session_uuid
+
+
+def set_access_cookie(response: Response, user: UserSessionInfo, session_uuid: str):
+    token = create_access_token(user.id, session_uuid, user.email, user.is_superuser)
+    response.set_cookie(
+        ACCESS_COOKIE,
+        value=token,
+        max_age=ACCESS_TOKEN_TTL,
+        httponly=True,
+    )
+
+
+async def get_token_user_info(request: Request) -> UserSessionInfo | None:
+    token = request.cookies.get(ACCESS_COOKIE)
+    if not token:
+        return None
+
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+
+    await sync_revocation_list()
+    if revocation_list.is_revoked(payload):
+        return None
+
+    return token_user_info(payload)
+
+
+async def get_user_info(request: Request, response: Response) -> UserSessionInfo:
+    if AUTH_MODE == "token":
+        user = await get_token_user_info(request)
+        if user is not None:
+            return user
+
+    user, session_uuid = await load_session(request)
+
+    # Missing or expired access token: fall back to the refresh session and
+    # reissue. Handlers returning a Response directly drop this cookie, the
+    # client then gets a new one on the next call or via /auth/refresh.
+    if AUTH_MODE == "token":
+        set_access_cookie(response, user, session_uuid)
+
+    return user
 
 
-async def get_current_user(request: Request) -> UserSessionInfo:
-    return await get_user_info(request)
+async def get_current_user(request: Request, response: Response) -> UserSessionInfo:
+    return await get_user_info(request, response)
 
 
-async def get_current_superuser(request: Request) -> UserSessionInfo:
-    user = await get_user_info(request)
+async def get_current_superuser(
+    request: Request, response: Response
+) -> UserSessionInfo:
+    user = await get_user_info(request, response)
     if not user.is_superuser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
     return user
@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import inspect
+import json
+from functools import wraps
+from uuid import uuid4
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from src.config import SINGLE_FLIGHT_REDIS, SINGLE_FLIGHT_TTL
+from src.database import wrote_recently
+from src.services import redis as redis_service
+from src.utils.logger import logger
+
+POLL_INTERVAL = 0.05
+
+inflight: dict[str, asyncio.Future] = {}
+
+
+def flight_key(request: Request, user) -> str:
+    query = sorted(request.query_params.multi_items())
+    access = "superuser" if user is not None and user.is_superuser else "user"
+    # A client pinned to the primary after a write must not share a flight
+    # that reads the replica, or it could get its own write back stale.
+    source = "primary" if wrote_recently(request) else "any"
+    # Set by ConditionalGet from the table generations; a handler that read
+    # before a write must not answer a request tagged after it.
+    etag = getattr(request.state, "etag", None)
+    raw = json.dumps([request.url.path, query, access, source, etag])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+async def run_across_workers(key: str, call):
+    """Let one worker run the query while the others wait for its result."""
+    lock_key, token = f"singleflight:{key}:lock", uuid4().hex
+    client = redis_service.redis_client
+    try:
+        acquired = await client.set(lock_key, token, nx=True, ex=SINGLE_FLIGHT_TTL)
+        if not acquired:
+            # The leader's token names its result, so a result left over
+            # from an earlier flight is never picked up.
+            leader = await client.get(lock_key)
+            deadline = asyncio.get_running_loop().time() + SINGLE_FLIGHT_TTL
+            while leader is not None and asyncio.get_running_loop().time() < deadline:
+                current = await client.get(lock_key)
+                result = await client.get(f"singleflight:{key}:{leader}")
+                if result is not None:
+                    return json.loads(result)
+                if current != leader:
+                    break
+                await asyncio.sleep(POLL_INTERVAL)
+            return await call()
+    except RedisError as e:
+        logger.warning(f"Single-flight lock failed: {e}")
+        return await call()
+
+    try:
+        result = jsonable_encoder(await call())
+        await client.set(
+            f"singleflight:{key}:{token}", json.dumps(result), ex=SINGLE_FLIGHT_TTL
+        )
+        return result
+    finally:
+        try:
+            await client.delete(lock_key)
+        except RedisError as e:
+            logger.warning(f"Failed to release single-flight lock: {e}")
+
+
+def single_flight(endpoint):
+    """Concurrent GETs with the same path, query, access, pinning and ETag share
+    one handler call. Goes under the router decorator."""
+    signature = inspect.signature(endpoint)
+    has_request = "request" in signature.parameters
+    if not has_request:
+        signature = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+            ]
+        )
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        request = kwargs["request"] if has_request else kwargs.pop("request")
+        key = flight_key(request, kwargs.get("user"))
+
+        async def call():
+            return await endpoint(*args, **kwargs)
+
+        future = inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader's client went away; run the handler ourselves.
+                if not future.cancelled():
+                    raise
+                return await call()
+
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            if SINGLE_FLIGHT_REDIS:
+                result = await run_across_workers(key, call)
+            else:
+                result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody waited for isn't logged.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del inflight[key]
+
+    wrapper.__signature__ = signature
+    return wrapper
@@ -0,0 +1,81 @@
+import time
+
+from src.auth.schemas import UserSessionInfo
+from src.config import (
+    ACCESS_TOKEN_TTL,
+    AUTH_MODE,
+    JWT_ALGORITHM,
+    JWT_SECRET,
+    REVOCATION_SYNC_INTERVAL,
+)
+
+ACCESS_COOKIE = "accesstoken"
+
+if AUTH_MODE == "token" and not JWT_SECRET:
+    raise RuntimeError("JWT_SECRET must be set when AUTH_MODE=token")
+
+
+class RevocationList:
+    """Local copy of users and sessions revoked within ACCESS_TOKEN_TTL."""
+
+    def __init__(self):
+        self.users: dict[int, float] = {}
+        self.sessions: dict[str, float] = {}
+        self.synced_at = 0.0
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.synced_at > REVOCATION_SYNC_INTERVAL
+
+    def update(self, users: dict[int, float], sessions: dict[str, float]):
+        self.users = users
+        self.sessions = sessions
+        self.synced_at = time.monotonic()
+
+    def add(self, user_id: int, session_uuid: str | None, revoked_at: float):
+        if session_uuid is None:
+            self.users[user_id] = revoked_at
+        else:
+            self.sessions[session_uuid] = revoked_at
+
+    def is_revoked(self, payload: dict) -> bool:
+        if payload["sid"] in self.sessions:
+            return True
+        return self.users.get(int(payload["sub"]), 0) >= payload["iat"]
+
+
+revocation_list = RevocationList()
+
+
+def create_access_token(
+    user_id: int, session_uuid: str, email: str, is_superuser: bool
+) -> str:
+    now = time.time()
+    payload = {
+        "sub": str(user_id),
+        "sid": session_uuid,
+        "email": email,
+        "su": is_superuser,
+        "iat": now,
+        "exp": int(now + ACCESS_TOKEN_TTL),
+    }
+    import jwt
+
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+
+def decode_access_token(token: str) -> dict | None:
+    # PyJWT pulls in cryptography, which session mode never needs.
+    import jwt
+
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+
+
+def token_user_info(payload: dict) -> UserSessionInfo:
+    return UserSessionInfo(
+        id=int(payload["sub"]),
+        email=payload["email"],
+        is_superuser=payload["su"],
+    )
@@ -0,0 +1,69 @@
+import calendar
+from datetime import date, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.user.queries import upcoming_dates_query
+from src.user.schemas import Celebration, UpcomingCelebrations
+
+
+def as_month_day(day: date) -> int:
+    return day.month * 100 + day.day
+
+
+def next_occurrence(day: date, today: date) -> date:
+    """First anniversary of day on or after today; 29 February falls on
+    1 March in non-leap years."""
+    for year in (today.year, today.year + 1):
+        try:
+            occurrence = date(year, day.month, day.day)
+        except ValueError:
+            occurrence = date(year, 3, 1)
+        if occurrence >= today:
+            return occurrence
+
+
+def month_day_window(today: date, days: int) -> tuple[int, int, date]:
+    end_date = today + timedelta(days=days - 1)
+    start = as_month_day(today)
+    if start == 301 and not calendar.isleap(today.year):
+        # 29 February is celebrated today.
+        start = 229
+    return start, as_month_day(end_date), end_date
+
+
+async def select_upcoming(
+    session: AsyncSession, field: str, today: date, days: int
+) -> list[Celebration]:
+    start, end, end_date = month_day_window(today, days)
+    query = upcoming_dates_query(field, end < start)
+    rows = await session.execute(query, {"start": start, "end": end})
+
+    celebrations = []
+    for user_id, name, surname, email, day in rows:
+        occurrence = next_occurrence(day, today)
+        years = occurrence.year - day.year
+        if occurrence > end_date or years < 1:
+            continue
+        celebrations.append(
+            Celebration(
+                id=user_id,
+                name=name,
+                surname=surname,
+                email=email,
+                date=occurrence,
+                years=years,
+            )
+        )
+    celebrations.sort(key=lambda c: (c.date, c.surname, c.name))
+    return celebrations
+
+
+async def build_celebrations(
+    session: AsyncSession, today: date, days: int
+) -> UpcomingCelebrations:
+    return UpcomingCelebrations(
+        start_date=today,
+        end_date=today + timedelta(days=days - 1),
+        birthdays=await select_upcoming(session, "birthday", today, days),
+        anniversaries=await select_upcoming(session, "joined_at", today, days),
+    )
@@ -0,0 +1,35 @@
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session_maker
+from src.databasemodels import User
+from src.services.jobs import job
+from src.services.outbox import record_event
+from src.services.redis import remove_all_user_session
+
+
+async def remove_user(session: AsyncSession, user_email: str) -> int | None:
+    """Delete a user with their vacations; returns the id, or None if there
+    was no such user."""
+    stmt = delete(User).filter(User.email == user_email).returning(User.id)
+    result = await session.execute(stmt)
+    user_id = result.scalar()
+    if user_id is not None:
+        record_event(
+            session,
+            "user.deleted",
+            ("user", "section", "vacation"),
+            {"email": user_email},
+        )
+    await session.commit()
+
+    if user_id is not None:
+        await remove_all_user_session(user_id)
+    return user_id
+
+
+@job("user.delete")
+async def delete_user_job(payload: dict) -> dict:
+    async with async_session_maker() as session:
+        user_id = await remove_user(session, payload["email"])
+    return {"deleted": user_id is not None}
@@ -0,0 +1,141 @@
+from functools import cache
+from sqlalchemy import (
+    Date,
+    Integer,
+    String,
+    and_,
+    bindparam,
+    column,
+    exists,
+    func,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.orm import aliased, selectinload
+
+from src.databasemodels import Position, Section, User, Vacation, month_day
+from src.vacation.queries import active_on
+
+# Statements are built once per variant and executed with bound parameters,
+# so requests skip construction and reuse the memoized cache key.
+
+user_by_email_query = (
+    select(User, Position.name, Section.name)
+    .outerjoin(Position, User.position_id == Position.id)
+    .outerjoin(Section, Position.section_id == Section.id)
+    .options(selectinload(User.receiven_vacations))
+    .filter(User.email == bindparam("email"))
+)
+
+
+@cache
+def users_list_query(
+    desc: bool, after_cursor: bool, by_surname: bool, on_vacation: bool | None
+):
+    today = bindparam("today", type_=Date)
+    query = (
+        select(
+            User.id,
+            User.name,
+            User.surname,
+            User.is_superuser,
+            User.email,
+            Position.name,
+            func.bool_or(Vacation.id.is_not(None)).label("is_on_vacation"),
+        )
+        .outerjoin(
+            Vacation, and_(User.id == Vacation.receiver_id, active_on(Vacation, today))
+        )
+        .outerjoin(Position, User.position_id == Position.id)
+        .group_by(User, Position.name)
+    )
+
+    query = (
+        query.order_by(User.surname.desc(), User.name.desc())
+        if desc
+        else query.order_by(User.surname, User.name)
+    )
+
+    if after_cursor:
+        cursor = tuple_(
+            bindparam("last_surname", type_=String),
+            bindparam("last_name", type_=String),
+        )
+        query = query.filter(
+            tuple_(User.surname, User.name) < cursor
+            if desc
+            else tuple_(User.surname, User.name) > cursor
+        )
+
+    if by_surname:
+        query = query.filter(User.surname.ilike(bindparam("surname_prefix")))
+
+    if on_vacation is not None:
+        aliasVac = aliased(Vacation)
+        vacation_filter = exists().where(
+            and_(active_on(aliasVac, today), aliasVac.receiver_id == User.id)
+        )
+        query = query.filter(vacation_filter if on_vacation else ~vacation_filter)
+
+    return query.limit(bindparam("limit", type_=Integer))
+
+
+@cache
+def users_export_query():
+    today = bindparam("today", type_=Date)
+    on_vacation = exists().where(
+        and_(Vacation.receiver_id == User.id, active_on(Vacation, today))
+    )
+    return (
+        select(
+            User.id,
+            User.name,
+            User.surname,
+            User.email,
+            User.is_superuser,
+            User.joined_at,
+            User.birthday,
+            Position.name.label("position_name"),
+            Section.name.label("section_name"),
+            on_vacation.label("is_on_vacation"),
+        )
+        .outerjoin(Position, User.position_id == Position.id)
+        .outerjoin(Section, Position.section_id == Section.id)
+        .order_by(User.id)
+    )
+
+
+existing_positions_query = select(Position.id).filter(
+    Position.id.in_(bindparam("ids", expanding=True))
+)
+
+
+def bulk_position_update(changes: list[tuple[str, int]]):
+    # One UPDATE ... FROM (VALUES ...) for the whole batch. Joining position
+    # skips rows that point at a missing position instead of failing the
+    # statement on the foreign key.
+    rows = values(
+        column("email", String), column("position_id", Integer), name="changes"
+    ).data(changes)
+    return (
+        update(User)
+        .filter(User.email == rows.c.email, Position.id == rows.c.position_id)
+        .values(position_id=rows.c.position_id)
+        .returning(User.email)
+    )
+
+
+@cache
+def upcoming_dates_query(field: str, wraps: bool):
+    # Filters on month_day(field), which ix_user_<field>_month_day indexes.
+    # A window across New Year is two ranges: the end of December and the
+    # start of January.
+    column = getattr(User, field)
+    key = month_day(column)
+    start = bindparam("start", type_=Integer)
+    end = bindparam("end", type_=Integer)
+    window = or_(key >= start, key <= end) if wraps else key.between(start, end)
+    return select(User.id, User.name, User.surname, User.email, column).filter(window)
@@ -1,25 +1,49 @@
 from datetime import date
 from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import EmailStr
-from sqlalchemy import and_, case, delete, exists, func, select, tuple_, update
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.auth.router import hash_password
 from src.auth.schemas import UserSessionInfo
+from src.services.cache import (
+    CachedResponse,
+    ConditionalGet,
+    ResponseCache,
+    etag_matches,
+    get_generations,
+)
+from src.services.outbox import record_event
 from src.utils.logger import logger
-from src.database import get_async_session
-from src.databasemodels import Position, Section, User, Vacation
+from src.database import get_async_session, get_read_session, get_read_session_maker
+from src.databasemodels import User
+from src.user.celebrations import build_celebrations
+from src.user.jobs import remove_user
+from src.user.queries import (
+    bulk_position_update,
+    existing_positions_query,
+    user_by_email_query,
+    users_export_query,
+    users_list_query,
+)
 from src.user.schemas import (
+    BulkPositionChange,
+    BulkPositionResponse,
     MessageResponse,
     UserInfo,
     UserPagination,
     UserPaginationResponse,
     UserPassChange,
+    UpcomingCelebrations,
+    UserPositionResult,
 )
+from src.services.jobs import enqueue
+from src.services.password import hash_password_async
+from src.services.ratelimit import RateLimiter
+from src.services.singleflight import single_flight
+from src.utils.export import MEDIA_TYPES, ExportFormat, stream_rows
 from src.services.redis import (
     get_current_superuser,
     get_current_user,
@@ -28,22 +52,33 @@ from src.services.redis import (
 
 router = APIRouter(prefix="/user", tags=["user"])
 
+celebrations_cache = ResponseCache(max_entries=64)
+
+
+def get_users_cost(request: Request) -> int:
+    cost = 1
+    if request.query_params.get("on_vacation_only") is not None:
+        cost += 1
+    page_size = request.query_params.get("page_size", "")
+    if page_size.isdigit() and int(page_size) > 50:
+        cost += 1
+    return cost
 
-@router.get("/{user_email}", response_model=UserInfo)
+
+@router.get(
+    "/{user_email}",
+    response_model=UserInfo,
+    dependencies=[
+        Depends(ConditionalGet("user", "position", "section", "vacation", daily=True)),
+        Depends(RateLimiter()),
+    ],
+)
 async def get_user_by_email(
     user: Annotated[UserSessionInfo, Depends(get_current_user)],
     user_email: EmailStr,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    query = (
-        select(User, Position.name, Section.name)
-        .outerjoin(Position, User.position_id == Position.id)
-        .outerjoin(Section, Position.section_id == Section.id)
-        .options(selectinload(User.receiven_vacations))
-        .filter(User.email == user_email)
-    )
-
-    result = await session.execute(query)
+    result = await session.execute(user_by_email_query, {"email": user_email})
     result = result.unique().one_or_none()
     if result is None:
         logger.warning(f"{user.email}: User {user_email} not found")
@@ -83,9 +118,10 @@ async def update_user_access(
         .returning(User.id)
     )
     result = await session.execute(stmt)
-    await session.commit()
-
     user_id = result.scalar()
+    if user_id is not None:
+        record_event(session, "user.promoted", ("user",), {"email": user_email})
+    await session.commit()
 
     if user_id is None:
         logger.warning(f"{user.email}: User {user_email} not found")
@@ -105,6 +141,7 @@ async def update_user_access(
 async def delete_user(
     user: Annotated[UserSessionInfo, Depends(get_current_superuser)],
     user_email: EmailStr,
+    run_async: bool = Query(False, description="Выполнить в фоновой задаче"),
     session: AsyncSession = Depends(get_async_session),
 ):
     if user.email == user_email:
@@ -113,11 +150,14 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"You cannot delete yourself"
         )
 
-    stmt = delete(User).filter(User.email == user_email).returning(User.id)
-    result = await session.execute(stmt)
-    await session.commit()
+    if run_async:
+        job_id = await enqueue("user.delete", {"email": user_email}, user.email)
+        logger.info(f"{user.email}: Queued deletion of {user_email}, job {job_id}")
+        return JSONResponse(
+            content={"job_id": job_id}, status_code=status.HTTP_202_ACCEPTED
+        )
 
-    user_id = result.scalar()
+    user_id = await remove_user(session, user_email)
 
     if user_id is None:
         logger.warning(
@@ -127,7 +167,6 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"User {user_email} not found"
         )
 
-    await remove_all_user_session(user_id)
     logger.info(f"{user.email}: User {user_email} deleted")
     return JSONResponse(
         content={"message": f"User {user_email} deleted"},
@@ -135,7 +174,15 @@ async def delete_user(
     )
 
 
-@router.get("/list/", response_model=UserPaginationResponse)
+@router.get(
+    "/list/",
+    response_model=UserPaginationResponse,
+    dependencies=[
+        Depends(ConditionalGet("user", "position", "vacation", daily=True)),
+        Depends(RateLimiter(cost=get_users_cost)),
+    ],
+)
+@single_flight
 async def get_users(
     desc: bool = Query(False, description="Тип сортировки"),
     filter_surname: Optional[str] = Query(None, description="Фамилия"),
@@ -150,73 +197,25 @@ async def get_users(
         None, description="Фильтр пользователей в отпуске (True/False)"
     ),
     user: UserSessionInfo = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     log = (
         f"{user.email}: Selected users with params pg_size = {page_size}, desc = {desc}"
     )
 
-    query = (
-        select(
-            User.id,
-            User.name,
-            User.surname,
-            User.is_superuser,
-            User.email,
-            Position.name,
-            func.bool_or(
-                case(
-                    (
-                        and_(
-                            Vacation.start_date <= date.today(),
-                            Vacation.end_date >= date.today(),
-                        ),
-                        True,
-                    ),
-                    else_=False,
-                )
-            ).label("is_on_vacation"),
-        )
-        .outerjoin(Vacation, User.id == Vacation.receiver_id)
-        .outerjoin(Position, User.position_id == Position.id)
-        .group_by(User, Position.name)
-    )
-
-    query = (
-        query.order_by(User.surname.desc(), User.name.desc())
-        if desc
-        else query.order_by(User.surname, User.name)
-    )
+    after_cursor = bool(last_surname and last_name)
+    query = users_list_query(desc, after_cursor, bool(filter_surname), on_vacation_only)
+    params = {"today": date.today(), "limit": page_size + 1}
 
-    if last_surname and last_name:
+    if after_cursor:
         log += f", last_surname = {last_surname}, last_name = {last_name}"
-
-        cursor_filter = (
-            tuple_(User.surname, User.name) < tuple_(last_surname, last_name)
-            if desc
-            else tuple_(User.surname, User.name) > tuple_(last_surname, last_name)
-        )
-        query = query.filter(cursor_filter)
+        params.update(last_surname=last_surname, last_name=last_name)
 
     if filter_surname:
         log += f", filter surname = {filter_surname}"
+        params["surname_prefix"] = f"{filter_surname}%"
 
-        query = query.filter(User.surname.ilike(f"{filter_surname}%"))
-
-    if on_vacation_only is not None:
-        aliasVac = aliased(Vacation)
-        vacation_filter = exists().where(
-            and_(
-                aliasVac.start_date <= date.today(),
-                aliasVac.end_date >= date.today(),
-                aliasVac.receiver_id == User.id,
-            )
-        )
-        query = query.filter(vacation_filter if on_vacation_only else ~vacation_filter)
-
-    query = query.limit(page_size + 1)
-
-    results = await session.execute(query)
+    results = await session.execute(query, params)
     results = results.all()
     users = [
         UserPagination(
@@ -246,6 +245,117 @@ async def get_users(
     )
 
 
+@router.get(
+    "/celebrations/",
+    response_model=UpcomingCelebrations,
+    dependencies=[Depends(RateLimiter())],
+)
+async def get_celebrations(
+    user: Annotated[UserSessionInfo, Depends(get_current_user)],
+    request: Request,
+    days: int = Query(14, ge=1, le=60, description="Количество дней вперёд"),
+    # Cached and ETagged under the user generation, so built from the primary.
+    session: AsyncSession = Depends(get_async_session),
+):
+    # The answer changes only at midnight or when users change.
+    today = date.today()
+    generations = await get_generations("user")
+    etag = f'"celebrations-{today}-{days}-{generations[0]}"' if generations else None
+
+    if etag_matches(request, etag):
+        logger.info(f"{user.email}: Celebrations not modified")
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    key = (today, days, generations)
+    cached = celebrations_cache.get(key) if generations else None
+    if cached is None:
+        report = await build_celebrations(session, today, days)
+        cached = CachedResponse(report.model_dump_json().encode("utf-8"), etag)
+        if generations:
+            celebrations_cache.set(key, cached)
+
+    body, headers = cached.for_request(request)
+    logger.info(f"{user.email}: Selected celebrations for {days} days")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export/", dependencies=[Depends(RateLimiter(cost=10))])
+async def export_users(
+    user: Annotated[UserSessionInfo, Depends(get_current_superuser)],
+    export_format: ExportFormat = Query(
+        "ndjson", alias="format", description="Формат выгрузки"
+    ),
+    session_maker: async_sessionmaker = Depends(get_read_session_maker),
+):
+    logger.info(f"{user.email}: Export users, format = {export_format}")
+    return StreamingResponse(
+        stream_rows(
+            session_maker,
+            users_export_query(),
+            {"today": date.today()},
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"'
+        },
+    )
+
+
+@router.patch("/bulk/position", response_model=BulkPositionResponse)
+async def update_users_positions(
+    user: Annotated[UserSessionInfo, Depends(get_current_superuser)],
+    data: BulkPositionChange,
+    session: AsyncSession = Depends(get_async_session),
+):
+    changes = [(item.user_email, item.position_id) for item in data.items]
+    try:
+        result = await session.execute(bulk_position_update(changes))
+        updated = set(result.scalars().all())
+        if updated:
+            record_event(
+                session,
+                "user.positions_changed",
+                ("user",),
+                {"emails": sorted(updated)},
+            )
+        await session.commit()
+    except IntegrityError:
+        # A position was deleted between the join and the foreign key check.
+        await session.rollback()
+        logger.warning(f"{user.email}: Bulk position update hit a removed position")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A position was removed during the update, retry",
+        )
+
+    missing_positions = set()
+    if len(updated) < len(changes):
+        requested = {position_id for _, position_id in changes}
+        result = await session.execute(existing_positions_query, {"ids": requested})
+        missing_positions = requested - set(result.scalars().all())
+
+    items = []
+    for user_email, position_id in changes:
+        if user_email in updated:
+            item_status = "updated"
+        elif position_id in missing_positions:
+            item_status = "position_not_found"
+        else:
+            item_status = "user_not_found"
+        items.append(UserPositionResult(user_email=user_email, status=item_status))
+
+    logger.info(
+        f"{user.email}: Bulk position update, {len(updated)} of {len(changes)} users"
+    )
+    response = BulkPositionResponse(updated=len(updated), items=items)
+    return JSONResponse(
+        content=response.model_dump(mode="json"), status_code=status.HTTP_200_OK
+    )
+
+
 @router.patch("/{user_email}/position/{position_id}", response_model=MessageResponse)
 async def update_user_position(
     user: Annotated[UserSessionInfo, Depends(get_current_superuser)],
@@ -260,6 +370,13 @@ async def update_user_position(
             .values(position_id=position_id)
         )
         result = await session.execute(stmt)
+        if result.rowcount:
+            record_event(
+                session,
+                "user.position_changed",
+                ("user",),
+                {"email": user_email, "position_id": position_id},
+            )
         await session.commit()
     except IntegrityError as e:
 
@@ -295,7 +412,7 @@ async def change_password(
     data: UserPassChange,
     session: AsyncSession = Depends(get_async_session),
 ):
-    hash_pass = hash_password(data.new_password)
+    hash_pass = await hash_password_async(data.new_password)
     stmt = (
         update(User).values(hashed_password=hash_pass).filter(User.email == user.email)
     )
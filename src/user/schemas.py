@@ -1,5 +1,8 @@
 from datetime import date
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+
+from src.config import BULK_UPDATE_MAX_ITEMS
 
 
 class MessageResponse(BaseModel):
@@ -57,3 +60,47 @@ class UserInfo(BaseModel):
 
 class UserPassChange(BaseModel):
     new_password: str = Field(min_length=4)
+
+
+class UserPositionChange(BaseModel):
+    user_email: EmailStr
+    position_id: int
+
+
+class BulkPositionChange(BaseModel):
+    items: list[UserPositionChange] = Field(
+        min_length=1, max_length=BULK_UPDATE_MAX_ITEMS
+    )
+
+    @field_validator("items")
+    def check_unique(cls, items):
+        emails = [item.user_email for item in items]
+        if len(set(emails)) != len(emails):
+            raise ValueError("each user can appear only once")
+        return items
+
+
+class UserPositionResult(BaseModel):
+    user_email: EmailStr
+    status: Literal["updated", "user_not_found", "position_not_found"]
+
+
+class BulkPositionResponse(BaseModel):
+    updated: int
+    items: list[UserPositionResult]
+
+
+class Celebration(BaseModel):
+    id: int
+    name: str
+    surname: str
+    email: EmailStr
+    date: date
+    years: int
+
+
+class UpcomingCelebrations(BaseModel):
+    start_date: date
+    end_date: date
+    birthdays: list[Celebration]
+    anniversaries: list[Celebration]
@@ -0,0 +1,65 @@
+"""Time argon2id parameters on this machine:
+
+python -m src.utils.bench_password [--target-ms 250]
+"""
+
+import argparse
+import time
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+TIME_COSTS = (1, 2, 3, 4)
+MEMORY_COSTS = (19456, 47104, 65536, 131072)
+PARALLELISM = (1, 2, 4)
+
+
+def time_hash(hasher, number: int) -> float:
+    hasher.hash("benchmark-password")
+    started = time.perf_counter()
+    for _ in range(number):
+        hasher.hash("benchmark-password")
+    return (time.perf_counter() - started) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'hasher':<34}{'ms/hash':>10}")
+    print(
+        f"{'bcrypt rounds=12 (legacy)':<34}{time_hash(BcryptHasher(), args.number):>10.1f}"
+    )
+
+    best = None
+    for parallelism in PARALLELISM:
+        for memory_cost in MEMORY_COSTS:
+            for time_cost in TIME_COSTS:
+                hasher = Argon2Hasher(
+                    time_cost=time_cost,
+                    memory_cost=memory_cost,
+                    parallelism=parallelism,
+                )
+                ms = time_hash(hasher, args.number)
+                name = f"argon2id t={time_cost} m={memory_cost} p={parallelism}"
+                print(f"{name:<34}{ms:>10.1f}")
+                # Prefer more memory, then more passes, within the target.
+                key = (memory_cost, time_cost, -parallelism)
+                if ms <= args.target_ms and (best is None or key > best[0]):
+                    best = (key, time_cost, memory_cost, parallelism, ms)
+
+    if best is None:
+        print(f"\nNo setting fits in {args.target_ms}ms")
+        return
+    _, time_cost, memory_cost, parallelism, ms = best
+    print(
+        f"\nStrongest within {args.target_ms}ms ({ms:.1f}ms):\n"
+        f"ARGON2_TIME_COST={time_cost}\n"
+        f"ARGON2_MEMORY_COST={memory_cost}\n"
+        f"ARGON2_PARALLELISM={parallelism}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""CPU per request spent building the hot list queries vs prebuilt ones:
+
+python -m src.utils.bench_queries
+"""
+
+import timeit
+from sqlalchemy.dialects import postgresql
+
+from src.position.queries import positions_list_query
+from src.section.queries import sections_list_query
+from src.user.queries import users_list_query
+from src.vacation.queries import vacations_list_query
+
+CASES = {
+    "users list": (users_list_query, (False, True, True, True)),
+    "vacations list": (vacations_list_query, (True, True, True, False, "active")),
+    "sections list": (sections_list_query, (False, True, True)),
+    "positions list": (positions_list_query, (False, True, True, True)),
+}
+
+
+def prepare(builder, args):
+    stmt = builder(*args)
+    stmt._generate_cache_key()
+    return stmt
+
+
+def main(number: int = 2000):
+    dialect = postgresql.asyncpg.dialect()
+    print(f"{'query':<16}{'rebuilt, us':>14}{'cached, us':>14}{'speedup':>10}")
+    for name, (builder, args) in CASES.items():
+        prepare(builder, args).compile(dialect=dialect)
+        rebuilt = timeit.timeit(
+            lambda: prepare(builder.__wrapped__, args), number=number
+        )
+        cached = timeit.timeit(lambda: prepare(builder, args), number=number)
+        print(
+            f"{name:<16}{rebuilt / number * 1e6:>14.1f}"
+            f"{cached / number * 1e6:>14.1f}{rebuilt / cached:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
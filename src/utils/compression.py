@@ -0,0 +1,166 @@
+import gzip
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.config import COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+)
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    encodings = set()
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_LEVEL)
+    return gzip.compress(body, compresslevel=COMPRESSION_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self.compressor = brotli.Compressor(quality=COMPRESSION_LEVEL)
+        else:
+            self.compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+        self.encoding = encoding
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flush after every chunk so streamed exports reach the client as
+        # they are produced instead of waiting for the compressor's buffer.
+        if self.encoding == "br":
+            return self.compressor.process(data) + self.compressor.flush()
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Strong ETags name exact bytes, so each encoding gets its own."""
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def decoded_etag(etag: str) -> str:
+    for encoding in ("gzip", "br"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip()
+    return content_type in COMPRESSIBLE_TYPES and "content-encoding" not in headers
+
+
+class CompressionMiddleware:
+    """gzip (or brotli, when installed) for allowlisted content types."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        compressor = None
+
+        def echo_encoded_etag(message):
+            # A 304 carries the tag the client holds, which names the
+            # compressed variant if that is what it was sent.
+            headers = MutableHeaders(raw=message["headers"])
+            etag = headers.get("etag")
+            if_none_match = Headers(scope=scope).get("if-none-match", "")
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if etag and tag != etag and decoded_etag(tag) == etag:
+                    headers["ETag"] = tag
+                    return
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 304:
+                    echo_encoded_etag(message)
+                    return await send(message)
+                if is_compressible(Headers(raw=message["headers"])):
+                    start_message = message
+                    return None
+                return await send(message)
+
+            if start_message is None or message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if compressor is None:
+                if not more_body:
+                    start, start_message = start_message, None
+                    if len(body) >= self.minimum_size:
+                        body = compress(body, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(body))
+                        headers.add_vary_header("Accept-Encoding")
+                        if "etag" in headers:
+                            headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+                    await send(start)
+                    return await send({**message, "body": body})
+
+                compressor = StreamCompressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+                del headers["Content-Length"]
+                await send(start_message)
+
+            data = (
+                compressor.chunk(body)
+                if more_body
+                else compressor.chunk(body) + compressor.finish()
+            )
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,12 +1,18 @@
+"""Create the root superuser if none exists:
+
+python -m src.utils.create_superuser
+"""
+
+import asyncio
 import contextlib
 from datetime import date
 from pydantic import EmailStr
 from sqlalchemy import insert, select
 
-from src.auth.router import hash_password
 from src.databasemodels import User
 from src.config import SUPERUSER_EMAIL, SUPERUSER_PASSWORD
-from src.database import get_async_session
+from src.database import engine, get_async_session
+from src.services.password import hash_password_async
 from src.utils.logger import logger
 
 get_async_session_context = contextlib.asynccontextmanager(get_async_session)
@@ -18,23 +24,33 @@ async def create_superuser(
     email: EmailStr = SUPERUSER_EMAIL,
     password: str = SUPERUSER_PASSWORD,
     is_superuser: bool = True,
-    birthday: date = date.today(),
+    birthday: date | None = None,
 ):
-    hashed_password = hash_password(password=password)
-    user_create = {
-        "name": name,
-        "surname": surname,
-        "position_id": None,
-        "email": email,
-        "hashed_password": hashed_password,
-        "is_superuser": is_superuser,
-        "birthday": birthday,
-    }
     async with get_async_session_context() as session:
         query = select(User.id).filter(User.is_superuser == True).limit(1)
         result = await session.execute(query)
-        if result.scalar() is None:
-            stmt = insert(User).values(user_create)
-            await session.execute(stmt)
-            await session.commit()
-            logger.info("Root created")
+        if result.scalar() is not None:
+            return
+
+        user_create = {
+            "name": name,
+            "surname": surname,
+            "position_id": None,
+            "email": email,
+            "hashed_password": await hash_password_async(password),
+            "is_superuser": is_superuser,
+            "birthday": birthday or date.today(),
+        }
+        stmt = insert(User).values(user_create)
+        await session.execute(stmt)
+        await session.commit()
+        logger.info("Root created")
+
+
+async def main():
+    await create_superuser()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
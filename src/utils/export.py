@@ -0,0 +1,49 @@
+import csv
+import io
+from typing import AsyncGenerator, Literal
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Executable
+
+from src.config import EXPORT_BATCH_SIZE
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def encode_batch(rows, columns: list[str], export_format: ExportFormat) -> bytes:
+    if export_format == "ndjson":
+        return b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_header(columns: list[str], export_format: ExportFormat) -> bytes:
+    if export_format == "ndjson":
+        return b""
+    return encode_batch([columns], columns, export_format)
+
+
+async def stream_rows(
+    session_maker: async_sessionmaker,
+    query: Executable,
+    params: dict,
+    export_format: ExportFormat,
+) -> AsyncGenerator[bytes, None]:
+    """Encode query rows batch by batch from a server-side cursor."""
+    # Not a dependency: those are closed before a StreamingResponse sends.
+    async with session_maker() as session:
+        result = await session.stream(
+            query, params, execution_options={"yield_per": EXPORT_BATCH_SIZE}
+        )
+        columns = list(result.keys())
+
+        header = encode_header(columns, export_format)
+        if header:
+            yield header
+
+        async for rows in result.partitions():
+            yield encode_batch(rows, columns, export_format)
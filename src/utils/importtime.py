@@ -0,0 +1,74 @@
+"""Import time digest of the app; exits with 1 over the budget:
+
+python -m src.utils.importtime [--module src.main] [--top 15] [--budget-ms 1500]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import Counter
+
+IMPORT_BUDGET_MS = 1500
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """(name, self_us, cumulative_us) of every module imported fresh."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def by_package(entries: list[tuple[str, int, int]]) -> Counter:
+    totals = Counter()
+    for name, self_us, _ in entries:
+        package = name.split(".")[0]
+        if package == "src":
+            package = ".".join(name.split(".")[:2])
+        totals[package] += self_us
+    return totals
+
+
+def report(module: str, top: int) -> int:
+    entries = measure(module)
+    total_us = next(cum for name, _, cum in entries if name == module)
+
+    print(f"{module}: {total_us / 1000:.1f}ms, {len(entries)} modules")
+    print(f"\nTop {top} packages by self time:")
+    for package, self_us in by_package(entries).most_common(top):
+        print(f"  {self_us / 1000:8.1f}ms  {package}")
+    print(f"\nTop {top} modules by self time:")
+    for name, self_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}ms  {name}")
+    return total_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=int, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    total_ms = report(args.module, args.top) / 1000
+    if total_ms > args.budget_ms:
+        print(f"\nOver budget: {total_ms:.1f}ms > {args.budget_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,22 @@ import os
 
 
 log_dir = "/app/logs"
-os.makedirs(log_dir, exist_ok=True)
 today_date = date.today()
 log_file = os.path.join(log_dir, f"app_{today_date}.log")
 level = logging.DEBUG
 name = "Logger"
 
-handler = logging.FileHandler(log_file)
+
+class LazyFileHandler(logging.FileHandler):
+    """Creates the log directory and opens the file on the first record
+    rather than at import."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+handler = LazyFileHandler(log_file, delay=True)
 handler.setLevel(level)
 
 dateformat = "%Y-%m-%d %H:%M:%S"
@@ -0,0 +1,66 @@
+"""Pre-create yearly partitions of the vacation table:
+
+python -m src.utils.partitions
+"""
+
+import asyncio
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.config import VACATION_PARTITIONS_AHEAD
+from src.database import engine
+from src.utils.logger import logger
+
+EXISTING_PARTITIONS_QUERY = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = 'vacation'"
+)
+
+
+def partition_name(year: int) -> str:
+    return f"vacation_y{year}"
+
+
+async def create_partition(conn: AsyncConnection, year: int):
+    name = partition_name(year)
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+
+    # Rows of that year may already sit in the default partition, and
+    # ATTACH refuses to run while they do, so move them first.
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE vacation INCLUDING DEFAULTS)"))
+    await conn.execute(
+        text(
+            "WITH moved AS (DELETE FROM vacation_default "
+            "WHERE start_date >= :start AND start_date < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE vacation ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+    logger.info(f"Created vacation partition {name}")
+
+
+async def ensure_vacation_partitions(years_ahead: int = VACATION_PARTITIONS_AHEAD):
+    this_year = date.today().year
+    async with engine.begin() as conn:
+        existing = set((await conn.execute(EXISTING_PARTITIONS_QUERY)).scalars())
+        for year in range(this_year, this_year + years_ahead + 1):
+            if partition_name(year) not in existing:
+                await create_partition(conn, year)
+
+
+async def main():
+    await ensure_vacation_partitions()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
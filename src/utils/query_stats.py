@@ -0,0 +1,35 @@
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHING_DISABLED,
+    NO_CACHE_KEY,
+)
+
+CACHE_STATUSES = {
+    CACHE_HIT: "hit",
+    CACHE_MISS: "miss",
+    CACHING_DISABLED: "disabled",
+    NO_CACHE_KEY: "no_key",
+}
+
+compiled_cache_stats: Counter = Counter()
+
+
+def track_compiled_cache(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_cache_hit(conn, cursor, statement, parameters, context, executemany):
+        if context is None or context.compiled is None:
+            compiled_cache_stats["raw"] += 1
+            return None
+        compiled_cache_stats[CACHE_STATUSES.get(context.cache_hit, "other")] += 1
+
+
+def compiled_cache_report() -> dict:
+    compiled = compiled_cache_stats["hit"] + compiled_cache_stats["miss"]
+    return {
+        **compiled_cache_stats,
+        "hit_ratio": compiled_cache_stats["hit"] / compiled if compiled else None,
+    }
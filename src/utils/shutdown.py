@@ -0,0 +1,127 @@
+import asyncio
+import signal
+import threading
+from typing import Callable
+from redis.exceptions import RedisError
+
+from src.config import SHUTDOWN_DRAIN_TIMEOUT, SHUTDOWN_PRESTOP_DELAY
+from src.database import engine, replica_engine
+from src.services import redis as redis_service
+from src.utils.logger import logger
+
+
+class Drain:
+    """Counts in-flight requests; readiness fails once draining begins."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.draining = False
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.callbacks: list[Callable[[], None]] = []
+
+    def on_begin(self, callback: Callable[[], None]):
+        self.callbacks.append(callback)
+
+    def begin(self):
+        if self.draining:
+            return None
+        self.draining = True
+        logger.info(f"Draining with {self.in_flight} requests in flight")
+        for callback in self.callbacks:
+            callback()
+
+    def request_started(self):
+        self.in_flight += 1
+        self.idle.clear()
+
+    def request_finished(self):
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self.idle.set()
+
+    async def wait(self, timeout: float) -> bool:
+        self.begin()
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+drain = Drain()
+
+
+def drain_on_signal(previous, delay: float = SHUTDOWN_PRESTOP_DELAY):
+    """Wrap the server's exit handler: the first signal starts draining and
+    hands over after delay, a second one at once."""
+    loop = asyncio.get_running_loop()
+    received = False
+
+    def hand_over(signum, frame):
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
+
+    def handler(signum, frame):
+        nonlocal received
+        if received:
+            return hand_over(signum, frame)
+        received = True
+        # Signal handlers run between bytecodes; defer to the loop.
+        loop.call_soon_threadsafe(drain.begin)
+        loop.call_soon_threadsafe(loop.call_later, delay, hand_over, signum, frame)
+
+    return handler
+
+
+def install_signal_handlers():
+    # Called from the lifespan, after Uvicorn has installed its own handlers,
+    # which it restores when serving ends.
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    for signum, delay in ((signal.SIGTERM, SHUTDOWN_PRESTOP_DELAY), (signal.SIGINT, 0)):
+        signal.signal(signum, drain_on_signal(signal.getsignal(signum), delay))
+
+
+class DrainMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        drain.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            drain.request_finished()
+
+
+async def cancel_tasks(tasks: list[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def close_connections():
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    try:
+        await redis_service.redis_client.aclose()
+    except RedisError as e:
+        logger.warning(f"Failed to close Redis client: {e}")
+
+
+async def shutdown(timeout: float = SHUTDOWN_DRAIN_TIMEOUT):
+    # Normally Uvicorn has already waited for open connections by now; this
+    # covers servers that send the lifespan shutdown without a signal.
+    if not await drain.wait(timeout):
+        logger.warning(
+            f"Drain deadline of {timeout}s passed with {drain.in_flight} requests in flight"
+        )
+    await close_connections()
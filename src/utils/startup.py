@@ -0,0 +1,55 @@
+import asyncio
+import time
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import STARTUP_WARM_CONNECTIONS
+from src.database import engine, replica_engine
+from src.services import redis as redis_service
+from src.services.password import dummy_hashes
+from src.utils.logger import logger
+
+
+async def warm_engine(engine: AsyncEngine, connections: int):
+    # Hold the connections concurrently, otherwise the pool hands the same
+    # one back each time and only a single connection gets opened.
+    async def check():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(check() for _ in range(connections)))
+
+
+async def warm_redis(connections: int):
+    await asyncio.gather(
+        *(redis_service.redis_client.ping() for _ in range(connections))
+    )
+
+
+async def timed(name: str, coro, timings: dict[str, float]):
+    started = time.perf_counter()
+    try:
+        await coro
+    except (OSError, SQLAlchemyError, RedisError) as e:
+        logger.warning(f"Startup warm-up of {name} failed: {e}")
+    timings[name] = time.perf_counter() - started
+
+
+async def warm_up(connections: int = STARTUP_WARM_CONNECTIONS) -> dict[str, float]:
+    """Open connections and build the dummy hashes before taking traffic;
+    returns seconds per step."""
+    timings: dict[str, float] = {}
+    await timed("db", warm_engine(engine, connections), timings)
+    if replica_engine is not None:
+        await timed("replica", warm_engine(replica_engine, connections), timings)
+    await timed("redis", warm_redis(connections), timings)
+    await timed("password", dummy_hashes.prepare(), timings)
+    return timings
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    return ", ".join(
+        f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items()
+    )
@@ -0,0 +1,26 @@
+"""Recompute the vacation ledger from the vacation table:
+
+python -m src.utils.vacation_ledger
+"""
+
+import asyncio
+from sqlalchemy import text
+
+from src.database import engine
+from src.utils.logger import logger
+from src.vacation.ledger import rebuild_ledger
+
+
+async def main():
+    # One transaction, so readers see either the old or the new ledger.
+    async with engine.begin() as conn:
+        await rebuild_ledger(conn)
+        rows = (
+            await conn.execute(text("SELECT count(*) FROM vacation_ledger"))
+        ).scalar()
+    logger.info(f"Rebuilt vacation ledger, {rows} rows")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
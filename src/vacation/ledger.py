@@ -0,0 +1,71 @@
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.config import VACATION_DAYS_PER_YEAR
+from src.databasemodels import VacationLedger
+
+# Splits every vacation by calendar year; the bulk counterpart of
+# days_by_year below.
+REBUILD_LEDGER_SQL = """
+INSERT INTO vacation_ledger (user_id, year, days_taken)
+SELECT v.receiver_id, y.year,
+       SUM(LEAST(v.end_date, make_date(y.year, 12, 31))
+           - GREATEST(v.start_date, make_date(y.year, 1, 1)) + 1)
+FROM vacation v
+CROSS JOIN LATERAL generate_series(
+    EXTRACT(YEAR FROM v.start_date)::int, EXTRACT(YEAR FROM v.end_date)::int
+) AS y(year)
+WHERE v.end_date IS NOT NULL
+GROUP BY v.receiver_id, y.year
+"""
+
+
+def days_by_year(start_date: date, end_date: date) -> dict[int, int]:
+    """Days of an inclusive date range falling into each calendar year."""
+    days = {}
+    for year in range(start_date.year, end_date.year + 1):
+        first = max(start_date, date(year, 1, 1))
+        last = min(end_date, date(year, 12, 31))
+        days[year] = (last - first).days + 1
+    return days
+
+
+def month_tables(start_date: date, end_date: date) -> tuple[str, ...]:
+    """Per-month generation names for the months a vacation touches, so
+    month-level caches are invalidated only for those months."""
+    tables = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        tables.append(f"vacation:{year}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tuple(tables)
+
+
+def accrued_days(joined_at: date | None, today: date) -> int:
+    if joined_at is None or joined_at > today:
+        return 0
+    return (today - joined_at).days * VACATION_DAYS_PER_YEAR // 365
+
+
+async def add_vacation_days(
+    session: AsyncSession, user_id: int, start_date: date, end_date: date
+):
+    rows = [
+        {"user_id": user_id, "year": year, "days_taken": days}
+        for year, days in days_by_year(start_date, end_date).items()
+    ]
+    stmt = insert(VacationLedger).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[VacationLedger.user_id, VacationLedger.year],
+        set_={"days_taken": VacationLedger.days_taken + stmt.excluded.days_taken},
+    )
+    await session.execute(stmt)
+
+
+async def rebuild_ledger(conn: AsyncConnection):
+    # Holds off incremental updates until the rebuild commits; reads go on.
+    await conn.execute(text("LOCK TABLE vacation_ledger IN EXCLUSIVE MODE"))
+    await conn.execute(text("DELETE FROM vacation_ledger"))
+    await conn.execute(text(REBUILD_LEDGER_SQL))
@@ -0,0 +1,113 @@
+from functools import cache
+from sqlalchemy import Date, Integer, and_, bindparam, func, select
+from sqlalchemy.orm import aliased, joinedload
+
+from src.config import VACATION_MAX_DAYS
+from src.databasemodels import Position, User, Vacation, VacationLedger
+
+
+def active_on(vacation, day):
+    # The lower bound on start_date is implied by VACATION_MAX_DAYS; stating
+    # it lets Postgres prune yearly partitions that cannot match.
+    return and_(
+        vacation.start_date <= day,
+        vacation.start_date >= day - VACATION_MAX_DAYS,
+        vacation.end_date >= day,
+    )
+
+
+vacation_by_id_query = (
+    select(Vacation)
+    .options(
+        joinedload(Vacation.giver).load_only(User.email),
+        joinedload(Vacation.receiver).load_only(User.email),
+    )
+    .filter(Vacation.id == bindparam("vacation_id"))
+)
+
+
+@cache
+def vacations_list_query(
+    desc: bool,
+    after_cursor: bool,
+    by_receiver: bool,
+    by_giver: bool,
+    status: str | None,
+):
+    query = select(Vacation).options(
+        joinedload(Vacation.giver).load_only(User.email),
+        joinedload(Vacation.receiver).load_only(User.email),
+    )
+
+    query = query.order_by(Vacation.id.desc()) if desc else query.order_by(Vacation.id)
+
+    if after_cursor:
+        last_id = bindparam("last_vacation_id", type_=Integer)
+        query = query.filter(Vacation.id < last_id if desc else Vacation.id > last_id)
+
+    if by_receiver:
+        query = query.filter(Vacation.receiver_id == bindparam("receiver_id"))
+
+    if by_giver:
+        query = query.filter(Vacation.giver_id == bindparam("giver_id"))
+
+    if status is not None:
+        today = bindparam("today", type_=Date)
+        status_filters = {
+            "active": active_on(Vacation, today),
+            "future": Vacation.start_date > today,
+            "past": Vacation.end_date < today,
+        }
+        query = query.filter(status_filters[status])
+
+    return query.limit(bindparam("limit", type_=Integer))
+
+
+@cache
+def vacations_export_query(after_cursor: bool):
+    giver = aliased(User)
+    receiver = aliased(User)
+    query = (
+        select(
+            Vacation.id,
+            giver.email.label("giver_email"),
+            receiver.email.label("receiver_email"),
+            Vacation.start_date,
+            Vacation.end_date,
+            Vacation.created_date,
+            Vacation.description,
+        )
+        .join(receiver, Vacation.receiver_id == receiver.id)
+        .outerjoin(giver, Vacation.giver_id == giver.id)
+        .filter(
+            Vacation.start_date <= bindparam("date_to", type_=Date),
+            Vacation.end_date >= bindparam("date_from", type_=Date),
+        )
+        .order_by(Vacation.id)
+    )
+
+    if after_cursor:
+        query = query.filter(Vacation.id > bindparam("after_id", type_=Integer))
+
+    return query
+
+
+@cache
+def balances_query(by_section: bool):
+    # Correlated per user, so each lookup is a primary key range scan of the
+    # ledger rather than an aggregate over the whole table.
+    taken = (
+        select(func.coalesce(func.sum(VacationLedger.days_taken), 0))
+        .filter(VacationLedger.user_id == User.id)
+        .scalar_subquery()
+    )
+    query = select(User.id, User.email, User.joined_at, taken.label("taken"))
+
+    if by_section:
+        return (
+            query.join(Position, User.position_id == Position.id)
+            .filter(Position.section_id == bindparam("section_id"))
+            .order_by(User.surname, User.name)
+        )
+
+    return query.filter(User.id == bindparam("user_id"))
@@ -0,0 +1,59 @@
+"""Records vacation.day_started once a day: vacation status changes at
+midnight without a write."""
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.database import async_session_maker
+from src.services import redis as redis_service
+from src.services.outbox import record_event
+from src.utils.logger import logger
+
+DAY_STARTED_TABLES = ("vacation", "user")
+DAY_STARTED_TTL = 2 * 24 * 60 * 60
+RETRY_DELAY = 60
+
+
+def day_started_key(day: date) -> str:
+    return f"vacation:day_started:{day.isoformat()}"
+
+
+async def record_day_started(day: date) -> bool:
+    """Record the event for day unless another worker already has."""
+    key = day_started_key(day)
+    client = redis_service.redis_client
+    if not await client.set(key, 1, nx=True, ex=DAY_STARTED_TTL):
+        return False
+    try:
+        async with async_session_maker() as session:
+            record_event(
+                session,
+                "vacation.day_started",
+                DAY_STARTED_TABLES,
+                {"date": day.isoformat()},
+            )
+            await session.commit()
+    except Exception:
+        # Let another worker, or this one on its next try, record it.
+        await client.delete(key)
+        raise
+    return True
+
+
+async def run_day_rollover():
+    while True:
+        tomorrow = date.today() + timedelta(days=1)
+        wait = datetime.combine(tomorrow, time.min) - datetime.now()
+        # A second late rather than waking just before midnight.
+        await asyncio.sleep(wait.total_seconds() + 1)
+
+        day = date.today()
+        while date.today() == day:
+            try:
+                await record_day_started(day)
+                break
+            except (OSError, RedisError, SQLAlchemyError) as e:
+                logger.warning(f"Failed to record start of {day}: {e}")
+                await asyncio.sleep(RETRY_DELAY)
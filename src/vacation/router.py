@@ -1,21 +1,33 @@
 from datetime import date
 from typing import Annotated, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse
-from sqlalchemy import and_, insert, select
-from sqlalchemy.orm import joinedload
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.exc import IntegrityError
 
 from src.databasemodels import User, Vacation
 from src.services.redis import get_current_superuser, get_current_user
-from src.database import get_async_session
+from src.database import get_async_session, get_read_session, get_read_session_maker
+from src.vacation.ledger import accrued_days, add_vacation_days, month_tables
+from src.vacation.queries import (
+    balances_query,
+    vacation_by_id_query,
+    vacations_export_query,
+    vacations_list_query,
+)
 from src.vacation.schemas import (
     MessageResponse,
+    SectionBalances,
+    VacationBalance,
     VacationCreate,
     VacationPaginationResponse,
     VacationRead,
 )
+from src.services.ratelimit import RateLimiter
+from src.utils.export import MEDIA_TYPES, ExportFormat, stream_rows
+from src.services.cache import ConditionalGet
+from src.services.outbox import record_event
 from src.utils.logger import logger
 
 router = APIRouter(prefix="/vacation", tags=["vacation"])
@@ -31,6 +43,15 @@ async def create_new_vacation(
         values = {**vacation.model_dump(), "giver_id": user.id}
         stmt = insert(Vacation).values(values)
         await session.execute(stmt)
+        await add_vacation_days(
+            session, vacation.receiver_id, vacation.start_date, vacation.end_date
+        )
+        record_event(
+            session,
+            "vacation.created",
+            ("vacation", *month_tables(vacation.start_date, vacation.end_date)),
+            {"receiver_id": vacation.receiver_id, "giver_id": user.id},
+        )
         await session.commit()
 
     except IntegrityError as e:
@@ -58,21 +79,77 @@ async def create_new_vacation(
     )
 
 
-@router.get("/{vacation_id}", response_model=VacationRead)
-async def get_vacation_by_id(
+def to_balance(row, today: date) -> VacationBalance:
+    user_id, email, joined_at, taken = row
+    accrued = accrued_days(joined_at, today)
+    return VacationBalance(
+        user_id=user_id,
+        email=email,
+        joined_at=joined_at,
+        accrued=accrued,
+        taken=taken,
+        balance=accrued - taken,
+    )
+
+
+@router.get(
+    "/balance/{user_id}",
+    response_model=VacationBalance,
+    dependencies=[Depends(ConditionalGet("vacation", "user", daily=True))],
+)
+async def get_balance(
     user: Annotated[User, Depends(get_current_user)],
-    vacation_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    user_id: int,
+    session: AsyncSession = Depends(get_read_session),
 ):
-    stmt = (
-        select(Vacation)
-        .options(
-            joinedload(Vacation.giver).load_only(User.email),
-            joinedload(Vacation.receiver).load_only(User.email),
+    result = await session.execute(balances_query(False), {"user_id": user_id})
+    row = result.one_or_none()
+
+    if row is None:
+        logger.warning(
+            f"{user.email}: Trying to select balance of a non-existent user {user_id}"
         )
-        .filter(Vacation.id == vacation_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    logger.info(f"{user.email}: Select vacation balance of user {user_id}")
+    return to_balance(row, date.today())
+
+
+@router.get(
+    "/balance/section/{section_id}",
+    response_model=SectionBalances,
+    dependencies=[
+        Depends(ConditionalGet("vacation", "user", "position", daily=True)),
+        Depends(RateLimiter()),
+    ],
+)
+async def get_section_balances(
+    user: Annotated[User, Depends(get_current_user)],
+    section_id: int,
+    session: AsyncSession = Depends(get_read_session),
+):
+    result = await session.execute(balances_query(True), {"section_id": section_id})
+    today = date.today()
+
+    logger.info(f"{user.email}: Select vacation balances of section {section_id}")
+    return SectionBalances(
+        section_id=section_id, items=[to_balance(row, today) for row in result]
     )
-    vacation = await session.execute(stmt)
+
+
+@router.get(
+    "/{vacation_id}",
+    response_model=VacationRead,
+    dependencies=[Depends(ConditionalGet("vacation", "user"))],
+)
+async def get_vacation_by_id(
+    user: Annotated[User, Depends(get_current_user)],
+    vacation_id: int,
+    session: AsyncSession = Depends(get_read_session),
+):
+    vacation = await session.execute(vacation_by_id_query, {"vacation_id": vacation_id})
 
     vacation = vacation.scalars().one_or_none()
 
@@ -95,7 +172,14 @@ async def get_vacation_by_id(
     )
 
 
-@router.get("/list/", response_model=VacationPaginationResponse)
+@router.get(
+    "/list/",
+    response_model=VacationPaginationResponse,
+    dependencies=[
+        Depends(ConditionalGet("vacation", "user", daily=True)),
+        Depends(RateLimiter()),
+    ],
+)
 async def get_vacations(
     desc: bool = Query(False, description="Тип сортировки"),
     page_size: int = Query(10, ge=1, le=100, description="Размер страницы"),
@@ -109,50 +193,36 @@ async def get_vacations(
     receiver_id: Optional[int] = Query(None),
     giver_id: Optional[int] = Query(None),
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     log = f"{user.email}: Selected vacations with params pg_size = {page_size}, desc = {desc}"
 
-    query = select(Vacation).options(
-        joinedload(Vacation.giver).load_only(User.email),
-        joinedload(Vacation.receiver).load_only(User.email),
+    query = vacations_list_query(
+        desc,
+        bool(last_vacation_id),
+        receiver_id is not None,
+        giver_id is not None,
+        status,
     )
-
-    query = query.order_by(Vacation.id.desc()) if desc else query.order_by(Vacation.id)
+    params = {"limit": page_size + 1}
 
     if last_vacation_id:
         log += f", last_id = {last_vacation_id}"
-
-        cursor_filter = (
-            (Vacation.id < last_vacation_id)
-            if desc
-            else (Vacation.id > last_vacation_id)
-        )
-        query = query.filter(cursor_filter)
+        params["last_vacation_id"] = last_vacation_id
 
     if receiver_id is not None:
         log += f", receiver_id = {receiver_id}"
-        query = query.filter(Vacation.receiver_id == receiver_id)
+        params["receiver_id"] = receiver_id
 
     if giver_id is not None:
         log += f", giver_id = {giver_id}"
-        query = query.filter(Vacation.giver_id == giver_id)
+        params["giver_id"] = giver_id
 
     if status is not None:
         log += f", status = {status}"
-        today = date.today()
-
-        status_filters = {
-            "active": and_(Vacation.start_date <= today, Vacation.end_date >= today),
-            "future": Vacation.start_date > today,
-            "past": Vacation.end_date < today,
-        }
+        params["today"] = date.today()
 
-        query = query.filter(status_filters[status])
-
-    query = query.limit(page_size + 1)
-
-    results = await session.execute(query)
+    results = await session.execute(query, params)
     results = results.scalars().all()
     vacations = [
         VacationRead(
@@ -175,3 +245,44 @@ async def get_vacations(
     return VacationPaginationResponse(
         items=vacations[:page_size], last_id=now_last_id, final=is_final, size=page_size
     )
+
+
+@router.get("/export/", dependencies=[Depends(RateLimiter(cost=10))])
+async def export_vacations(
+    user: Annotated[User, Depends(get_current_superuser)],
+    date_from: date = Query(description="Начало периода"),
+    date_to: date = Query(description="Конец периода"),
+    after_id: Optional[int] = Query(
+        None, description="Последняя выгруженная запись, для продолжения выгрузки"
+    ),
+    export_format: ExportFormat = Query(
+        "ndjson", alias="format", description="Формат выгрузки"
+    ),
+    session_maker: async_sessionmaker = Depends(get_read_session_maker),
+):
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be earlier than date_to",
+        )
+
+    log = f"{user.email}: Export vacations from {date_from} to {date_to}, format = {export_format}"
+
+    params = {"date_from": date_from, "date_to": date_to}
+    if after_id is not None:
+        log += f", after_id = {after_id}"
+        params["after_id"] = after_id
+
+    logger.info(log)
+    return StreamingResponse(
+        stream_rows(
+            session_maker,
+            vacations_export_query(after_id is not None),
+            params,
+            export_format,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="vacations_{date_from}_{date_to}.{export_format}"'
+        },
+    )
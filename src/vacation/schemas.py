@@ -2,6 +2,8 @@ from datetime import date
 from typing import Optional
 from pydantic import BaseModel, ConfigDict, EmailStr, model_validator
 
+from src.config import VACATION_MAX_DAYS
+
 
 class MessageResponse(BaseModel):
     Message: str
@@ -34,8 +36,28 @@ class VacationCreate(BaseModel):
 
         return values
 
+    @model_validator(mode="after")
+    def check_duration(self):
+        if (self.end_date - self.start_date).days > VACATION_MAX_DAYS:
+            raise ValueError(f"vacation cannot be longer than {VACATION_MAX_DAYS} days")
+        return self
+
 
 class VacationPaginationResponse(BaseModel):
     items: list[VacationRead]
     last_id: int | None
     size: int
+
+
+class VacationBalance(BaseModel):
+    user_id: int
+    email: EmailStr
+    joined_at: date | None
+    accrued: int
+    taken: int
+    balance: int
+
+
+class SectionBalances(BaseModel):
+    section_id: int
+    items: list[VacationBalance]
@@ -9,9 +9,9 @@ from redis.asyncio import Redis
 from sqlalchemy import NullPool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
-from src.auth.router import hash_password
+from src.services.password import hash_password
 from src.databasemodels import Base, Position, Section, User
-from src.database import get_async_session
+from src.database import get_async_session, get_read_session, get_read_session_maker
 from src.main import app
 from src.config import (
     DB_NAME,
@@ -96,6 +96,8 @@ async def override_db_dependency():
             yield session
 
     app.dependency_overrides[get_async_session] = _override_get_session
+    app.dependency_overrides[get_read_session] = _override_get_session
+    app.dependency_overrides[get_read_session_maker] = lambda: test_async_session_maker
     yield
     app.dependency_overrides.clear()
 
@@ -0,0 +1,133 @@
+from datetime import date
+from fastapi import status
+import pytest
+from sqlalchemy import delete
+
+from src.database import get_read_session_maker
+from src.databasemodels import Position, Section, User
+from src.main import app
+from src.services import outbox
+
+base = "/analytics/"
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("regular_client", status.HTTP_200_OK),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_get_month_absence(client_fixture, expected_status):
+    today = date.today()
+    respond = await client_fixture.get(base + f"absence/{today.year}/{today.month}")
+    assert respond.status_code == expected_status
+
+
+async def test_get_month_absence_invalid_month(regular_client):
+    respond = await regular_client.get(base + "absence/2025/13")
+    assert respond.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.fixture
+async def absence_section(monkeypatch):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(outbox, "async_session_maker", session_maker)
+    async with session_maker() as session:
+        section = Section(name="Аналитика")
+        session.add(section)
+        await session.flush()
+        position = Position(name="Аналитик", section_id=section.id)
+        session.add(position)
+        await session.flush()
+        users = [
+            User(
+                name="Absent",
+                surname=surname,
+                email=f"{surname}@example.com",
+                hashed_password="-",
+                position_id=position.id,
+            )
+            for surname in ("absent-a", "absent-b")
+        ]
+        session.add_all(users)
+        await session.commit()
+    user_ids = [user.id for user in users]
+    try:
+        yield section.id, user_ids
+    finally:
+        # Vacations and positions go with them.
+        async with session_maker() as session:
+            await session.execute(delete(User).filter(User.id.in_(user_ids)))
+            await session.execute(delete(Section).filter(Section.id == section.id))
+            await session.commit()
+
+
+async def create_vacation(client, receiver_id: int, start_date: str, end_date: str):
+    respond = await client.post(
+        "/vacation/create",
+        json={
+            "receiver_id": receiver_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "description": "analytics",
+        },
+    )
+    assert respond.status_code == status.HTTP_201_CREATED
+    while await outbox.dispatch_pending():
+        pass
+
+
+async def section_absence(client, year: int, month: int, section_id: int):
+    respond = await client.get(base + f"absence/{year}/{month}")
+    assert respond.status_code == status.HTTP_200_OK
+    sections = [s for s in respond.json()["sections"] if s["section_id"] == section_id]
+    return respond, sections[0] if sections else None
+
+
+async def test_month_absence_counts_days_within_month(admin_client, absence_section):
+    section_id, (first, second) = absence_section
+    await create_vacation(admin_client, first, "2030-12-28", "2031-01-03")
+    await create_vacation(admin_client, second, "2031-01-02", "2031-01-04")
+    await create_vacation(admin_client, second, "2031-01-31", "2031-02-02")
+
+    respond, january = await section_absence(admin_client, 2031, 1, section_id)
+    # 3 + 3 + 1 days, clipped to January.
+    assert january["days_off"] == 7
+    assert january["peak_absent"] == 2
+    # Ties go to the earliest day.
+    assert january["peak_day"] == "2031-01-02"
+    assert respond.json()["peak_days"] == [
+        {"day": "2031-01-02", "absent": 2},
+        {"day": "2031-01-03", "absent": 2},
+        {"day": "2031-01-01", "absent": 1},
+        {"day": "2031-01-04", "absent": 1},
+        {"day": "2031-01-31", "absent": 1},
+    ]
+
+    _, december = await section_absence(admin_client, 2030, 12, section_id)
+    assert december["days_off"] == 4
+    assert december["peak_day"] == "2030-12-28"
+    _, february = await section_absence(admin_client, 2031, 2, section_id)
+    assert february["days_off"] == 2
+
+
+async def test_month_absence_invalidated_by_vacation_in_month(
+    admin_client, absence_section
+):
+    section_id, (first, _) = absence_section
+    await create_vacation(admin_client, first, "2032-03-01", "2032-03-02")
+
+    before, march = await section_absence(admin_client, 2032, 3, section_id)
+    assert march["days_off"] == 2
+    april, _ = await section_absence(admin_client, 2032, 4, section_id)
+
+    await create_vacation(admin_client, first, "2032-03-10", "2032-03-10")
+
+    after, march = await section_absence(admin_client, 2032, 3, section_id)
+    assert march["days_off"] == 3
+    assert after.headers["ETag"] != before.headers["ETag"]
+    # Other months keep their cached report.
+    unchanged, _ = await section_absence(admin_client, 2032, 4, section_id)
+    assert unchanged.headers["ETag"] == april.headers["ETag"]
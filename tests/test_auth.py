@@ -0,0 +1,72 @@
+import bcrypt
+from fastapi import status
+import pytest
+
+from src.config import SUPERUSER_PASSWORD
+from src.services.password import DummyHashes, verify_password
+
+base = "/auth/"
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_200_OK),
+        ("regular_client", status.HTTP_200_OK),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_refresh(client_fixture, expected_status):
+    respond = await client_fixture.post(base + "refresh")
+    assert respond.status_code == expected_status
+
+
+@pytest.mark.parametrize(
+    "credentials",
+    [
+        {"email": "root@example.com", "password": "wrong-password"},
+        {"email": "nobody@example.com", "password": "wrong-password"},
+    ],
+)
+async def test_login_bad_credentials(unauthorized_client, credentials):
+    respond = await unauthorized_client.post(base + "login", json=credentials)
+    assert respond.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_bcrypt_hash_rehashed_on_verify():
+    legacy_hash = bcrypt.hashpw(b"password", bcrypt.gensalt()).decode("utf-8")
+
+    verified, new_hash = verify_password("password", legacy_hash)
+    assert verified
+    assert new_hash.startswith("$argon2id$")
+    assert verify_password("password", new_hash) == (True, None)
+    assert verify_password("wrong", legacy_hash) == (False, None)
+
+
+async def test_unknown_email_case_variant_does_not_block_login(unauthorized_client):
+    respond = await unauthorized_client.post(
+        base + "login",
+        json={"email": "ROOT@example.com", "password": SUPERUSER_PASSWORD},
+    )
+    assert respond.status_code == status.HTTP_401_UNAUTHORIZED
+
+    respond = await unauthorized_client.post(
+        base + "login",
+        json={"email": "root@example.com", "password": SUPERUSER_PASSWORD},
+    )
+    assert respond.status_code == status.HTTP_200_OK
+
+
+async def test_dummy_hash_matches_legacy_share():
+    dummy = DummyHashes()
+    emails = [f"user{i}@example.com" for i in range(200)]
+
+    assert {await dummy.for_email(email) for email in emails} == {dummy.argon2}
+
+    dummy.legacy_share = 0.5
+    picked = [await dummy.for_email(email) for email in emails]
+    assert 60 < picked.count(dummy.bcrypt) < 140
+    assert dummy.bcrypt.startswith("$2")
+    # The same email always costs the same.
+    assert picked == [await dummy.for_email(email) for email in emails]
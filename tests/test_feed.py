@@ -0,0 +1,187 @@
+from fastapi import status
+import pytest
+from sqlalchemy import select
+
+from src.config import CHANGE_FEED_BUFFER
+from src.database import get_read_session_maker
+from src.databasemodels import outbox_publish_seq
+from src.feed import router as feed_router
+from src.feed.queries import published_upto_query
+from src.feed.router import replay_missed, stream_changes
+from src.main import app
+from src.services import outbox
+from src.services.changefeed import (
+    CLOSED,
+    DROPPED,
+    FEED_TABLES,
+    RESYNC,
+    ChangeFeed,
+    Subscriber,
+    change_feed,
+    format_event,
+)
+from src.services.outbox import dispatch_pending, record_event
+from src.utils.shutdown import drain
+
+base = "/feed/"
+
+FEED_TOPICS = set(FEED_TABLES)
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("regular_client", status.HTTP_422_UNPROCESSABLE_ENTITY),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_changes_unknown_table(client_fixture, expected_status):
+    respond = await client_fixture.get(base + "changes", params={"tables": "outbox"})
+    assert respond.status_code == expected_status
+
+
+async def publish_events(session_maker, *tables) -> list[int]:
+    async with session_maker() as session:
+        for table in tables:
+            record_event(session, "test.replayed", (table,))
+        await session.commit()
+    while await dispatch_pending():
+        pass
+    async with session_maker() as session:
+        upto = await session.scalar(published_upto_query)
+    return list(range(upto - len(tables) + 1, upto + 1))
+
+
+async def test_replay_missed(monkeypatch):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(outbox, "async_session_maker", session_maker)
+    seqs = await publish_events(session_maker, "section", "vacation:2026-10", "user")
+
+    async with session_maker() as session:
+        replayed, upto = await replay_missed(
+            session, seqs[0] - 1, {"section", "vacation"}
+        )
+    assert upto == seqs[-1]
+    assert [message["seq"] for message in replayed] == seqs[:2]
+    assert replayed[1]["tables"] == ["vacation:2026-10"]
+
+
+async def test_replay_missed_resyncs_on_gap(monkeypatch):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(outbox, "async_session_maker", session_maker)
+    monkeypatch.setattr(feed_router, "REPLAY_RETRY_DELAY", 0)
+    seqs = await publish_events(session_maker, "section")
+
+    async with session_maker() as session:
+        # A number handed out to a dispatch that never committed.
+        await session.scalar(select(outbox_publish_seq.next_value()))
+        await session.commit()
+    await publish_events(session_maker, "section")
+
+    async with session_maker() as session:
+        assert (await replay_missed(session, seqs[0], FEED_TOPICS))[0] is None
+        # Further than anything published, e.g. from before a restore.
+        assert (await replay_missed(session, seqs[0] + 10, FEED_TOPICS))[0] is None
+
+
+def change(seq: int, *tables: str) -> dict:
+    return {"seq": seq, "event": "test.changed", "tables": list(tables)}
+
+
+def test_format_event():
+    message = {**change(7, "user"), "payload": {"email": "я@example.com"}}
+    assert format_event(message) == (
+        "id: 7\n"
+        "event: test.changed\n"
+        'data: {"tables": ["user"], "payload": {"email": "я@example.com"}}\n\n'
+    )
+    assert format_event(RESYNC) == "event: resync\ndata: {}\n\n"
+
+
+def test_subscriber_topics():
+    subscriber = Subscriber({"vacation"})
+    assert subscriber.wants(change(1, "vacation:2026-10"))
+    assert subscriber.wants(change(2, "user", "vacation"))
+    assert not subscriber.wants(change(3, "section", "position"))
+
+
+def test_subscriber_end_replaces_backlog():
+    subscriber = Subscriber({"user"}, buffer=2)
+    assert subscriber.offer(change(1, "user"))
+    assert subscriber.offer(change(2, "user"))
+    assert not subscriber.offer(change(3, "user"))
+
+    subscriber.end(CLOSED)
+    assert subscriber.queue.get_nowait() is CLOSED
+    assert subscriber.queue.empty()
+
+
+def test_publish_drops_slow_subscriber():
+    feed = ChangeFeed(max_clients=2)
+    slow = feed.subscribe({"user"})
+    other = feed.subscribe({"section"})
+
+    for seq in range(CHANGE_FEED_BUFFER + 1):
+        feed.publish(change(seq, "user"))
+
+    assert slow not in feed.subscribers
+    assert slow.queue.get_nowait() is DROPPED
+    assert other in feed.subscribers
+    assert other.queue.empty()
+
+
+def test_subscribe_limits():
+    feed = ChangeFeed(max_clients=1)
+    subscriber = feed.subscribe({"user"})
+    assert feed.subscribe({"user"}) is None
+
+    feed.close()
+    assert subscriber.queue.get_nowait() is CLOSED
+    assert feed.subscribe({"user"}) is None
+
+
+async def collect(stream, count: int) -> list[str]:
+    return [await anext(stream) for _ in range(count)]
+
+
+async def test_stream_replays_heartbeats_and_skips_replayed(monkeypatch):
+    monkeypatch.setattr(feed_router, "CHANGE_FEED_HEARTBEAT", 0.01)
+    subscriber = change_feed.subscribe({"user"})
+    stream = stream_changes(
+        subscriber, [change(4, "user"), change(5, "user")], "test@example.com", 5
+    )
+    try:
+        assert await collect(stream, 3) == [
+            "retry: 3000\n\n",
+            format_event(change(4, "user")),
+            format_event(change(5, "user")),
+        ]
+        assert await anext(stream) == ": ping\n\n"
+
+        # Published while the replay was read, then again after it.
+        change_feed.publish(change(5, "user"))
+        change_feed.publish(change(6, "user"))
+        assert await anext(stream) == format_event(change(6, "user"))
+    finally:
+        await stream.aclose()
+    assert subscriber not in change_feed.subscribers
+
+
+async def test_stream_ends_when_drain_begins(monkeypatch):
+    feed = ChangeFeed()
+    monkeypatch.setattr(drain, "callbacks", [feed.close])
+    monkeypatch.setattr(drain, "draining", False)
+    stream = stream_changes(feed.subscribe({"user"}), [], "test@example.com")
+    assert await anext(stream) == "retry: 3000\n\n"
+
+    drain.begin()
+    assert await anext(stream) == format_event(CLOSED)
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+
+
+async def test_changes_full(regular_client, monkeypatch):
+    monkeypatch.setattr(change_feed, "max_clients", 0)
+    respond = await regular_client.get(base + "changes")
+    assert respond.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
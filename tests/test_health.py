@@ -0,0 +1,69 @@
+import asyncio
+import signal
+from fastapi import status
+import pytest
+
+from src.health import router as health_router
+from src.health.router import ReadinessCache
+from src.utils.shutdown import drain, drain_on_signal
+
+base = "/health/"
+
+
+async def test_live(unauthorized_client):
+    respond = await unauthorized_client.get(base + "live")
+    assert respond.status_code == status.HTTP_200_OK
+
+
+async def healthy():
+    return None
+
+
+async def unreachable():
+    raise OSError("connection refused")
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    # The real probes use the app's engine, which the test overrides don't
+    # cover, and results are cached between calls.
+    monkeypatch.setattr(health_router, "readiness_cache", ReadinessCache())
+    monkeypatch.setattr(health_router, "check_postgres", healthy)
+    monkeypatch.setattr(health_router, "check_redis", healthy)
+    monkeypatch.setattr(drain, "draining", False)
+    return monkeypatch
+
+
+async def test_ready(unauthorized_client, probes):
+    respond = await unauthorized_client.get(base + "ready")
+    assert respond.status_code == status.HTTP_200_OK
+    assert respond.json()["status"] == "ready"
+    assert {"postgres", "redis", "pools"} <= respond.json().keys()
+
+
+async def test_not_ready_when_postgres_fails(unauthorized_client, probes):
+    probes.setattr(health_router, "check_postgres", unreachable)
+
+    respond = await unauthorized_client.get(base + "ready")
+    assert respond.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert respond.json()["status"] == "unavailable"
+    assert not respond.json()["postgres"]["ok"]
+    assert "connection refused" in respond.json()["postgres"]["error"]
+    assert respond.json()["redis"]["ok"]
+
+
+async def test_ready_fails_once_sigterm_arrives(unauthorized_client, probes):
+    probes.setattr(drain, "callbacks", [])
+    handed_over = asyncio.Event()
+    handler = drain_on_signal(lambda signum, frame: handed_over.set(), delay=0.2)
+
+    handler(signal.SIGTERM, None)
+    await asyncio.sleep(0.01)
+
+    # Pre-stop window: healthy and still serving, but no longer ready.
+    respond = await unauthorized_client.get(base + "ready")
+    assert respond.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert respond.json()["status"] == "draining"
+    assert not handed_over.is_set()
+
+    await asyncio.wait_for(handed_over.wait(), 1)
@@ -0,0 +1,108 @@
+import asyncio
+from fastapi import status
+import pytest
+
+from src.database import get_read_session_maker
+from src.main import app
+from src.services import jobs
+from src.services.jobs import (
+    QUEUE_KEY,
+    RUNNING_KEY,
+    claim_job,
+    enqueue,
+    get_job,
+    job_key,
+    run_job,
+)
+from src.user import jobs as user_jobs
+
+base = "/jobs/"
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_404_NOT_FOUND),
+        ("regular_client", status.HTTP_403_FORBIDDEN),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_get_unknown_job(client_fixture, expected_status):
+    respond = await client_fixture.get(base + "00000000-0000-0000-0000-000000000000")
+    assert respond.status_code == expected_status
+
+
+async def test_queue_user_deletion(admin_client, mock_redis, monkeypatch):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(user_jobs, "async_session_maker", session_maker)
+    email = "queued-deletion@example.com"
+    respond = await admin_client.post(
+        "/auth/register",
+        json={
+            "name": "Queued",
+            "surname": "Deletion",
+            "email": email,
+            "password": "password",
+            "birthday": "1990-01-01",
+        },
+    )
+    assert respond.status_code == status.HTTP_201_CREATED
+
+    respond = await admin_client.delete(f"/user/{email}", params={"run_async": True})
+    assert respond.status_code == status.HTTP_202_ACCEPTED
+    job_id = respond.json()["job_id"]
+
+    try:
+        # No worker runs in tests: take the job off the queue and run it here.
+        assert await mock_redis.lrem(QUEUE_KEY, 0, job_id) == 1
+        await run_job(job_id)
+
+        respond = await admin_client.get(base + job_id)
+        assert respond.status_code == status.HTTP_200_OK
+        assert respond.json()["name"] == "user.delete"
+        assert respond.json()["status"] == "succeeded"
+        assert respond.json()["result"] == {"deleted": True}
+
+        respond = await admin_client.get(f"/user/{email}")
+        assert respond.status_code == status.HTTP_404_NOT_FOUND
+    finally:
+        await mock_redis.lrem(QUEUE_KEY, 0, job_id)
+        await mock_redis.zrem(RUNNING_KEY, job_id)
+        await mock_redis.delete(job_key(job_id))
+
+
+async def test_claim_job_leases_it(mock_redis):
+    job_id = await enqueue("test.claimed", {}, "root@example.com")
+    try:
+        assert await claim_job() == job_id
+        assert await mock_redis.zscore(RUNNING_KEY, job_id) is not None
+        assert job_id not in await mock_redis.lrange(QUEUE_KEY, 0, -1)
+    finally:
+        await mock_redis.zrem(RUNNING_KEY, job_id)
+        await mock_redis.delete(job_key(job_id))
+
+
+async def test_stopping_worker_requeues_running_jobs(mock_redis, monkeypatch):
+    started = asyncio.Event()
+
+    async def slow_handler(payload: dict):
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setitem(jobs.job_handlers, "test.slow", slow_handler)
+    job_id = await enqueue("test.slow", {}, "root@example.com")
+    worker = asyncio.create_task(jobs.run_worker(stop_timeout=0.05))
+    try:
+        await asyncio.wait_for(started.wait(), 5)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+        assert (await get_job(job_id))["status"] == "queued"
+        assert await mock_redis.zscore(RUNNING_KEY, job_id) is None
+        assert await mock_redis.lrange(QUEUE_KEY, -1, -1) == [job_id]
+    finally:
+        worker.cancel()
+        await mock_redis.lrem(QUEUE_KEY, 0, job_id)
+        await mock_redis.zrem(RUNNING_KEY, job_id)
+        await mock_redis.delete(job_key(job_id))
@@ -0,0 +1,28 @@
+from fastapi import status
+import pytest
+
+base = "/org/"
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_200_OK),
+        ("regular_client", status.HTTP_200_OK),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_get_org_tree(client_fixture, expected_status):
+    respond = await client_fixture.get(base + "tree")
+    assert respond.status_code == expected_status
+
+
+async def test_get_org_tree_not_modified(regular_client):
+    respond = await regular_client.get(base + "tree")
+    assert respond.status_code == status.HTTP_200_OK
+
+    respond = await regular_client.get(
+        base + "tree", headers={"If-None-Match": respond.headers["ETag"]}
+    )
+    assert respond.status_code == status.HTTP_304_NOT_MODIFIED
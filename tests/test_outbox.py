@@ -0,0 +1,112 @@
+import asyncio
+import json
+from sqlalchemy import select
+
+from src.database import get_read_session_maker
+from src.databasemodels import OutboxEvent
+from src.main import app
+from src.services import outbox
+from src.services.cache import GenerationMirror, generation_key, generation_mirror
+from src.services.outbox import OUTBOX_CHANNEL, dispatch_pending, record_event
+
+
+def test_generation_mirror():
+    mirror = GenerationMirror()
+    mirror.update({"user": 3})
+    assert mirror.get(("user",)) is None
+
+    mirror.set_live(True)
+    assert mirror.get(("user",)) is None
+    mirror.update({"user": 3, "section": 1})
+    mirror.update({"user": 2})
+    assert mirror.get(("user", "section")) == (3, 1)
+    assert mirror.get(("user", "position")) is None
+
+    mirror.set_live(False)
+    assert mirror.get(("user",)) is None
+
+
+async def test_record_event_wakes_dispatcher_on_commit():
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    outbox.outbox_wakeup.clear()
+
+    async with session_maker() as session:
+        record_event(session, "test.rolled_back", ("section",))
+        await session.rollback()
+    assert not outbox.outbox_wakeup.is_set()
+
+    async with session_maker() as session:
+        record_event(session, "test.committed", ("section",))
+        await session.commit()
+    assert outbox.outbox_wakeup.is_set()
+
+    async with session_maker() as session:
+        names = (await session.execute(select(OutboxEvent.event))).scalars().all()
+    assert "test.committed" in names
+    assert "test.rolled_back" not in names
+
+
+async def test_dispatch_bumps_and_publishes(mock_redis, monkeypatch):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(outbox, "async_session_maker", session_maker)
+    before = int(await mock_redis.get(generation_key("position")) or 0)
+
+    async with session_maker() as session:
+        record_event(session, "test.dispatched", ("position",), {"name": "x"})
+        await session.commit()
+
+    pubsub = mock_redis.pubsub()
+    await pubsub.subscribe(OUTBOX_CHANNEL)
+    try:
+        while await dispatch_pending():
+            pass
+
+        messages = []
+        while (message := await pubsub.get_message(timeout=0.5)) is not None:
+            if message["type"] == "message":
+                messages.append(json.loads(message["data"]))
+    finally:
+        await pubsub.aclose()
+
+    ours = [m for m in messages if m["event"] == "test.dispatched"]
+    assert len(ours) == 1
+    assert ours[0]["payload"] == {"name": "x"}
+    assert ours[0]["seq"] > 0
+    assert ours[0]["generations"]["position"] > before
+    assert int(await mock_redis.get(generation_key("position"))) > before
+
+    async with session_maker() as session:
+        pending = await session.execute(
+            select(OutboxEvent).filter(OutboxEvent.published_at.is_(None))
+        )
+        assert pending.first() is None
+
+
+async def test_subscriber_feeds_mirror(mock_redis, monkeypatch):
+    monkeypatch.setattr(generation_mirror, "live", False)
+    monkeypatch.setattr(generation_mirror, "values", {})
+    task = asyncio.create_task(outbox.run_subscriber())
+    try:
+        for _ in range(100):
+            if generation_mirror.live:
+                break
+            await asyncio.sleep(0.01)
+        assert generation_mirror.live
+
+        message = {
+            "id": 1,
+            "event": "test.bumped",
+            "tables": ["vacation"],
+            "payload": None,
+            "generations": {"vacation": 41},
+        }
+        await mock_redis.publish(OUTBOX_CHANNEL, json.dumps(message))
+        for _ in range(100):
+            if generation_mirror.get(("vacation",)) == (41,):
+                break
+            await asyncio.sleep(0.01)
+        assert generation_mirror.get(("vacation",)) == (41,)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    assert not generation_mirror.live
@@ -91,3 +91,34 @@ async def test_delete_position(client_fixture, expected_status):
     if respond.status_code == status.HTTP_200_OK:
         respond = await client_fixture.get(base + "Position")
         assert respond.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_200_OK),
+        ("regular_client", status.HTTP_403_FORBIDDEN),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_bulk_section_update(client_fixture, expected_status):
+    items = [
+        {"position_name": "Должность", "section_id": 1},
+        {"position_name": "Нет такой", "section_id": 1},
+        {"position_name": "Должность", "section_id": 999},
+    ]
+    respond = await client_fixture.patch(
+        base + "bulk/section", json={"items": items[:2]}
+    )
+    assert respond.status_code == expected_status
+    if respond.status_code == status.HTTP_200_OK:
+        assert [item["status"] for item in respond.json()["items"]] == [
+            "updated",
+            "position_not_found",
+        ]
+        # The same position twice is rejected before touching the database.
+        respond = await client_fixture.patch(
+            base + "bulk/section", json={"items": items}
+        )
+        assert respond.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,6 +1,10 @@
 from fastapi import status
 import pytest
 
+from src import database
+from src.database import get_read_session_maker
+from src.main import app
+
 base = "/section/"
 
 
@@ -92,3 +96,33 @@ async def test_delete_section(client_fixture, expected_status):
     if respond.status_code == status.HTTP_200_OK:
         respond = await client_fixture.get(base + "Section")
         assert respond.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_get_section_not_modified(regular_client):
+    respond = await regular_client.get(base + "Отдел")
+    assert respond.status_code == status.HTTP_200_OK
+
+    respond = await regular_client.get(
+        base + "Отдел", headers={"If-None-Match": respond.headers["ETag"]}
+    )
+    assert respond.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+async def test_get_section_from_replica_not_tagged(regular_client, monkeypatch):
+    # Pretend the overridden read session maker is the replica.
+    read_session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(database, "replica_session_maker", read_session_maker)
+
+    respond = await regular_client.get(base + "Отдел")
+    assert respond.status_code == status.HTTP_200_OK
+    assert "ETag" not in respond.headers
+
+
+async def test_section_create_idempotent(admin_client):
+    headers = {"Idempotency-Key": "create-idempotent-section"}
+    for _ in range(2):
+        respond = await admin_client.post(
+            base + "create", json={"name": "Idempotent"}, headers=headers
+        )
+        assert respond.status_code == status.HTTP_201_CREATED
+    assert respond.headers["Idempotent-Replayed"] == "true"
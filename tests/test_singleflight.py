@@ -0,0 +1,196 @@
+import asyncio
+import json
+import time
+import pytest
+from starlette.requests import Request
+
+from src.auth.schemas import UserSessionInfo
+from src.database import PRIMARY_COOKIE
+from src.services import singleflight
+from src.services.singleflight import flight_key, single_flight
+
+user = UserSessionInfo(id=2, email="test@example.com", is_superuser=False)
+
+
+def make_request(
+    query: str = "", pinned: bool = False, etag: str | None = None
+) -> Request:
+    headers = []
+    if pinned:
+        cookie = f"{PRIMARY_COOKIE}={int(time.time()) + 60}"
+        headers.append((b"cookie", cookie.encode()))
+    state = {} if etag is None else {"etag": etag}
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/section/list/",
+            "query_string": query.encode(),
+            "headers": headers,
+            "state": state,
+        }
+    )
+
+
+def counting_endpoint(result=None, error=None, delay=0.05):
+    calls = []
+
+    @single_flight
+    async def endpoint(user: UserSessionInfo):
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return endpoint, calls
+
+
+async def test_concurrent_calls_share_one_handler_call():
+    endpoint, calls = counting_endpoint({"items": []})
+
+    results = await asyncio.gather(
+        *(endpoint(user=user, request=make_request("page_size=10")) for _ in range(5))
+    )
+
+    assert results == [{"items": []}] * 5
+    assert len(calls) == 1
+    assert not singleflight.inflight
+
+
+async def test_different_queries_do_not_share():
+    endpoint, calls = counting_endpoint({"items": []})
+
+    await asyncio.gather(
+        endpoint(user=user, request=make_request("page_size=10")),
+        endpoint(user=user, request=make_request("page_size=20")),
+    )
+
+    assert len(calls) == 2
+
+
+async def test_exception_is_shared_with_followers():
+    endpoint, calls = counting_endpoint(error=ValueError("boom"))
+
+    results = await asyncio.gather(
+        *(endpoint(user=user, request=make_request()) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 1
+
+
+async def test_follower_runs_handler_when_leader_is_cancelled():
+    endpoint, calls = counting_endpoint({"items": [1]})
+
+    leader = asyncio.create_task(endpoint(user=user, request=make_request()))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(endpoint(user=user, request=make_request()))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == {"items": [1]}
+    assert len(calls) == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+def test_pinned_client_gets_its_own_flight():
+    assert flight_key(make_request(), user) != flight_key(
+        make_request(pinned=True), user
+    )
+    assert flight_key(make_request(), user) == flight_key(make_request(), user)
+    assert flight_key(make_request(etag='"1"'), user) != flight_key(
+        make_request(etag='"2"'), user
+    )
+
+
+async def test_waits_for_result_of_another_worker(mock_redis, monkeypatch):
+    monkeypatch.setattr(singleflight, "SINGLE_FLIGHT_REDIS", True)
+    endpoint, calls = counting_endpoint({"items": ["mine"]})
+    request = make_request("page_size=30")
+    key = flight_key(request, user)
+
+    # Another worker holds the lock and publishes its result shortly.
+    await mock_redis.set(f"singleflight:{key}:lock", "theirs", ex=5)
+
+    async def publish():
+        await asyncio.sleep(0.1)
+        await mock_redis.set(
+            f"singleflight:{key}:theirs", json.dumps({"items": ["theirs"]}), ex=5
+        )
+
+    publisher = asyncio.create_task(publish())
+    try:
+        assert await endpoint(user=user, request=request) == {"items": ["theirs"]}
+        assert not calls
+    finally:
+        await publisher
+        await mock_redis.delete(
+            f"singleflight:{key}:lock", f"singleflight:{key}:theirs"
+        )
+
+
+async def test_write_between_flights_is_not_served_stale(mock_redis, monkeypatch):
+    monkeypatch.setattr(singleflight, "SINGLE_FLIGHT_REDIS", True)
+    endpoint, calls = counting_endpoint({"items": ["after write"]})
+    request = make_request("page_size=50")
+    key = flight_key(request, user)
+
+    # The previous flight's result outlives it; the current one's leader
+    # read after the write and publishes shortly.
+    await mock_redis.set(
+        f"singleflight:{key}:previous", json.dumps({"items": ["before"]}), ex=5
+    )
+    await mock_redis.set(f"singleflight:{key}:lock", "current", ex=5)
+
+    async def publish():
+        await asyncio.sleep(0.1)
+        await mock_redis.set(
+            f"singleflight:{key}:current",
+            json.dumps({"items": ["after write"]}),
+            ex=5,
+        )
+
+    publisher = asyncio.create_task(publish())
+    try:
+        assert await endpoint(user=user, request=request) == {"items": ["after write"]}
+        assert not calls
+    finally:
+        await publisher
+        await mock_redis.delete(
+            f"singleflight:{key}:lock",
+            f"singleflight:{key}:previous",
+            f"singleflight:{key}:current",
+        )
+
+
+async def test_request_after_write_does_not_join_earlier_flight():
+    endpoint, calls = counting_endpoint({"items": []})
+
+    # Same query, but the generations were bumped between the two requests.
+    leader = asyncio.create_task(
+        endpoint(user=user, request=make_request(etag='"before"'))
+    )
+    await asyncio.sleep(0.01)
+    await endpoint(user=user, request=make_request(etag='"after"'))
+    await leader
+
+    assert len(calls) == 2
+
+
+async def test_leader_publishes_result_for_other_workers(mock_redis, monkeypatch):
+    monkeypatch.setattr(singleflight, "SINGLE_FLIGHT_REDIS", True)
+    endpoint, calls = counting_endpoint({"items": ["mine"]})
+    request = make_request("page_size=40")
+    key = flight_key(request, user)
+
+    try:
+        assert await endpoint(user=user, request=request) == {"items": ["mine"]}
+        results = await mock_redis.keys(f"singleflight:{key}:*")
+        assert len(results) == 1
+        assert json.loads(await mock_redis.get(results[0])) == {"items": ["mine"]}
+        assert not await mock_redis.exists(f"singleflight:{key}:lock")
+    finally:
+        await mock_redis.delete(*await mock_redis.keys(f"singleflight:{key}:*"))
@@ -1,7 +1,18 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
 from fastapi import status
 import pytest
+from sqlalchemy import delete
 
 from src.config import SUPERUSER_PASSWORD
+from src.database import get_read_session_maker
+from src.databasemodels import Position, Section, User, Vacation
+from src.main import app
+from src.user import router as user_router
+from src.user.celebrations import month_day_window, next_occurrence
+from src.utils.compression import CompressionMiddleware
 
 base = "/user/"
 
@@ -137,3 +148,256 @@ async def test_password_change(client_fixture, expected_status, mock_redis):
     if respond.status_code == 200:
         key = "user_sessions:2"
         assert await mock_redis.exists(key) == 0
+
+
+async def test_get_users_rate_limit_headers(regular_client):
+    respond = await regular_client.get(base + "list/", params={"page_size": 100})
+    assert respond.status_code == status.HTTP_200_OK
+    assert "RateLimit-Remaining" in respond.headers
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_200_OK),
+        ("regular_client", status.HTTP_403_FORBIDDEN),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_users(client_fixture, expected_status, export_format):
+    respond = await client_fixture.get(
+        base + "export/", params={"format": export_format}
+    )
+    assert respond.status_code == expected_status
+
+
+USER_EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "surname",
+    "email",
+    "is_superuser",
+    "joined_at",
+    "birthday",
+    "position_name",
+    "section_name",
+    "is_on_vacation",
+]
+
+
+async def test_export_users_rows(admin_client):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    today = date.today()
+    async with session_maker() as session:
+        section = Section(name="Экспорт")
+        session.add(section)
+        await session.flush()
+        position = Position(name="Экспортёр", section_id=section.id)
+        session.add(position)
+        await session.flush()
+        exported = User(
+            name="Exported",
+            surname="User",
+            email="exported@example.com",
+            hashed_password="-",
+            position_id=position.id,
+            joined_at=date(2021, 4, 1),
+            birthday=date(1990, 5, 6),
+        )
+        session.add(exported)
+        await session.flush()
+        session.add(
+            Vacation(
+                receiver_id=exported.id,
+                start_date=today,
+                end_date=today + timedelta(days=1),
+            )
+        )
+        await session.commit()
+
+    try:
+        respond = await admin_client.get(base + "export/")
+        assert respond.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in respond.text.splitlines()]
+        assert all(list(row) == USER_EXPORT_COLUMNS for row in rows)
+        ids = [row["id"] for row in rows]
+        assert ids == sorted(ids)
+        by_email = {row["email"]: row for row in rows}
+        assert by_email["exported@example.com"] == {
+            "id": exported.id,
+            "name": "Exported",
+            "surname": "User",
+            "email": "exported@example.com",
+            "is_superuser": False,
+            "joined_at": "2021-04-01",
+            "birthday": "1990-05-06",
+            "position_name": "Экспортёр",
+            "section_name": "Экспорт",
+            "is_on_vacation": True,
+        }
+        assert by_email["root@example.com"]["is_superuser"]
+
+        respond = await admin_client.get(base + "export/", params={"format": "csv"})
+        header, *csv_rows = csv.reader(io.StringIO(respond.text))
+        assert header == USER_EXPORT_COLUMNS
+        assert [int(row[0]) for row in csv_rows] == ids
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(User).filter(User.id == exported.id))
+            await session.execute(delete(Section).filter(Section.id == section.id))
+            await session.commit()
+
+
+def compression_middleware() -> CompressionMiddleware:
+    layer = app.middleware_stack
+    while not isinstance(layer, CompressionMiddleware):
+        layer = layer.app
+    return layer
+
+
+async def test_get_users_compressed(regular_client, monkeypatch):
+    # The fixture data is far below the real threshold.
+    monkeypatch.setattr(compression_middleware(), "minimum_size", 1)
+
+    respond = await regular_client.get(
+        base + "list/",
+        params={"page_size": 100},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert respond.status_code == status.HTTP_200_OK
+    assert respond.headers["Content-Encoding"] == "gzip"
+    gzip_etag = respond.headers["ETag"]
+    assert gzip_etag.endswith('-gzip"')
+
+    respond = await regular_client.get(
+        base + "list/",
+        params={"page_size": 100},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "Content-Encoding" not in respond.headers
+    assert respond.headers["ETag"] != gzip_etag
+
+    respond = await regular_client.get(
+        base + "list/",
+        params={"page_size": 100},
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag},
+    )
+    assert respond.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_200_OK),
+        ("regular_client", status.HTTP_403_FORBIDDEN),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_bulk_position_update(client_fixture, expected_status):
+    items = [
+        {"user_email": "test@example.com", "position_id": 1},
+        {"user_email": "nobody@example.com", "position_id": 1},
+        {"user_email": "root@example.com", "position_id": 999},
+    ]
+    respond = await client_fixture.patch(base + "bulk/position", json={"items": items})
+    assert respond.status_code == expected_status
+    if respond.status_code == status.HTTP_200_OK:
+        assert respond.json()["updated"] == 1
+        assert [item["status"] for item in respond.json()["items"]] == [
+            "updated",
+            "user_not_found",
+            "position_not_found",
+        ]
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("regular_client", status.HTTP_200_OK),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+@pytest.mark.parametrize("params", [{}, {"days": 1}, {"days": 60}])
+async def test_get_celebrations(client_fixture, expected_status, params):
+    respond = await client_fixture.get(base + "celebrations/", params=params)
+    assert respond.status_code == expected_status
+    if respond.status_code == status.HTTP_200_OK:
+        assert set(respond.json()) == {
+            "start_date",
+            "end_date",
+            "birthdays",
+            "anniversaries",
+        }
+
+
+@pytest.mark.parametrize(
+    "today, days, expected",
+    [
+        (date(2026, 6, 1), 14, (601, 614, date(2026, 6, 14))),
+        (date(2026, 12, 25), 14, (1225, 107, date(2027, 1, 7))),
+        (date(2027, 3, 1), 3, (229, 303, date(2027, 3, 3))),
+        (date(2028, 3, 1), 3, (301, 303, date(2028, 3, 3))),
+    ],
+)
+def test_month_day_window(today, days, expected):
+    assert month_day_window(today, days) == expected
+
+
+@pytest.mark.parametrize(
+    "day, today, expected",
+    [
+        (date(1990, 1, 2), date(2026, 12, 25), date(2027, 1, 2)),
+        (date(1990, 12, 31), date(2026, 12, 25), date(2026, 12, 31)),
+        (date(1990, 12, 25), date(2026, 12, 25), date(2026, 12, 25)),
+        (date(2000, 2, 29), date(2027, 2, 20), date(2027, 3, 1)),
+        (date(2000, 2, 29), date(2028, 2, 20), date(2028, 2, 29)),
+    ],
+)
+def test_next_occurrence(day, today, expected):
+    assert next_occurrence(day, today) == expected
+
+
+async def test_celebrations_across_new_year(admin_client, monkeypatch):
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2025, 12, 30)
+
+    monkeypatch.setattr(user_router, "date", FrozenDate)
+    birthdays = {
+        "new-year-eve@example.com": "1990-12-31",
+        "new-year@example.com": "1991-01-01",
+        "summer@example.com": "1990-06-15",
+        "newborn@example.com": "2025-12-31",
+    }
+    for email, birthday in birthdays.items():
+        respond = await admin_client.post(
+            "/auth/register",
+            json={
+                "name": "Birthday",
+                "surname": email,
+                "email": email,
+                "password": "password",
+                "birthday": birthday,
+            },
+        )
+        assert respond.status_code == status.HTTP_201_CREATED
+
+    try:
+        respond = await admin_client.get(base + "celebrations/", params={"days": 5})
+        assert respond.status_code == status.HTTP_200_OK
+        assert respond.json()["end_date"] == "2026-01-03"
+        assert [
+            (item["email"], item["date"], item["years"])
+            for item in respond.json()["birthdays"]
+        ] == [
+            ("new-year-eve@example.com", "2025-12-31", 35),
+            ("new-year@example.com", "2026-01-01", 35),
+        ]
+    finally:
+        for email in birthdays:
+            await admin_client.delete(base + email)
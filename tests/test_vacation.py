@@ -1,5 +1,18 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
 from fastapi import status
 import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from src.config import VACATION_MAX_DAYS
+from src.database import get_read_session_maker
+from src.databasemodels import OutboxEvent, User, Vacation, VacationLedger
+from src.main import app
+from src.vacation import rollover
+from src.vacation.ledger import days_by_year, rebuild_ledger
 
 base = "/vacation/"
 
@@ -71,3 +84,233 @@ async def test_get_vacation(client_fixture, expected_status):
 async def test_get_vacations(client_fixture, expected_status, params):
     respond = await client_fixture.get(base + "list/", params=params)
     assert respond.status_code == expected_status
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("admin_client", status.HTTP_200_OK),
+        ("regular_client", status.HTTP_403_FORBIDDEN),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"date_from": "2024-01-01", "date_to": "2024-12-31"},
+        {"date_from": "2024-01-01", "date_to": "2026-12-31", "format": "csv"},
+        {"date_from": "2024-01-01", "date_to": "2024-12-31", "after_id": 1},
+    ],
+)
+async def test_export_vacations(client_fixture, expected_status, params):
+    respond = await client_fixture.get(base + "export/", params=params)
+    assert respond.status_code == expected_status
+
+
+@pytest.mark.parametrize(
+    "client_fixture, expected_status",
+    [
+        ("regular_client", status.HTTP_200_OK),
+        ("unauthorized_client", status.HTTP_401_UNAUTHORIZED),
+    ],
+    indirect=["client_fixture"],
+)
+async def test_get_balance(client_fixture, expected_status):
+    respond = await client_fixture.get(base + "balance/1")
+    assert respond.status_code == expected_status
+    if expected_status == status.HTTP_200_OK:
+        balance = respond.json()
+        assert balance["balance"] == balance["accrued"] - balance["taken"]
+
+
+async def test_get_section_balances(regular_client):
+    respond = await regular_client.get(base + "balance/section/1")
+    assert respond.status_code == status.HTTP_200_OK
+
+
+async def test_day_started_recorded_once(mock_redis, monkeypatch):
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    monkeypatch.setattr(rollover, "async_session_maker", session_maker)
+    day = date(2026, 10, 20)
+
+    try:
+        assert await rollover.record_day_started(day)
+        # Another worker waking at the same midnight.
+        assert not await rollover.record_day_started(day)
+
+        async with session_maker() as session:
+            payloads = await session.execute(
+                select(OutboxEvent.payload).filter(
+                    OutboxEvent.event == "vacation.day_started"
+                )
+            )
+        assert payloads.scalars().all().count({"date": "2026-10-20"}) == 1
+    finally:
+        await mock_redis.delete(rollover.day_started_key(day))
+
+
+async def test_vacation_longer_than_limit_rejected_by_db():
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    start_date = date(2020, 1, 1)
+    async with session_maker() as session:
+        session.add(
+            Vacation(
+                receiver_id=2,
+                start_date=start_date,
+                end_date=start_date + timedelta(days=VACATION_MAX_DAYS + 1),
+            )
+        )
+        with pytest.raises(IntegrityError, match="ck_vacation_max_days"):
+            await session.commit()
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, expected",
+    [
+        (date(2025, 3, 3), date(2025, 3, 7), {2025: 5}),
+        (date(2025, 12, 30), date(2026, 1, 2), {2025: 2, 2026: 2}),
+        (date(2024, 2, 28), date(2024, 3, 1), {2024: 3}),
+        (date(2023, 12, 31), date(2025, 1, 1), {2023: 1, 2024: 366, 2025: 1}),
+    ],
+)
+def test_days_by_year(start_date, end_date, expected):
+    assert days_by_year(start_date, end_date) == expected
+
+
+@pytest.fixture
+async def ledger_user():
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    async with session_maker() as session:
+        user = User(
+            name="Ledger",
+            surname="User",
+            email="ledger@example.com",
+            hashed_password="-",
+            joined_at=date(2020, 1, 1),
+        )
+        session.add(user)
+        await session.commit()
+    try:
+        yield user.id
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(User).filter(User.id == user.id))
+            await session.commit()
+
+
+async def ledger_rows(user_id: int) -> dict[int, int]:
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    async with session_maker() as session:
+        rows = await session.execute(
+            select(VacationLedger.year, VacationLedger.days_taken).filter(
+                VacationLedger.user_id == user_id
+            )
+        )
+    return dict(rows.all())
+
+
+async def test_vacation_across_new_year_is_taken_per_year(admin_client, ledger_user):
+    respond = await admin_client.get(base + f"balance/{ledger_user}")
+    assert respond.json()["taken"] == 0
+
+    for start_date, end_date in [
+        ("2029-12-30", "2030-01-02"),
+        ("2030-06-01", "2030-06-03"),
+    ]:
+        respond = await admin_client.post(
+            base + "create",
+            json={
+                "receiver_id": ledger_user,
+                "start_date": start_date,
+                "end_date": end_date,
+                "description": "ledger",
+            },
+        )
+        assert respond.status_code == status.HTTP_201_CREATED
+
+    respond = await admin_client.get(base + f"balance/{ledger_user}")
+    assert respond.json()["taken"] == 7
+    assert respond.json()["balance"] == respond.json()["accrued"] - 7
+    assert await ledger_rows(ledger_user) == {2029: 2, 2030: 5}
+
+    # A full rebuild from the vacations agrees with the incremental updates.
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    async with session_maker() as session:
+        await rebuild_ledger(await session.connection())
+        await session.commit()
+    assert await ledger_rows(ledger_user) == {2029: 2, 2030: 5}
+
+
+EXPORT_COLUMNS = [
+    "id",
+    "giver_email",
+    "receiver_email",
+    "start_date",
+    "end_date",
+    "created_date",
+    "description",
+]
+
+
+@pytest.fixture
+async def exported_vacations(admin_client, ledger_user):
+    periods = [
+        ("2035-02-20", "2035-02-28"),
+        ("2035-03-01", "2035-03-05"),
+        ("2035-03-20", "2035-04-02"),
+        ("2035-05-01", "2035-05-02"),
+    ]
+    for start_date, end_date in periods:
+        respond = await admin_client.post(
+            base + "create",
+            json={
+                "receiver_id": ledger_user,
+                "start_date": start_date,
+                "end_date": end_date,
+                "description": "export",
+            },
+        )
+        assert respond.status_code == status.HTTP_201_CREATED
+
+    session_maker = app.dependency_overrides[get_read_session_maker]()
+    async with session_maker() as session:
+        ids = await session.execute(
+            select(Vacation.id)
+            .filter(Vacation.receiver_id == ledger_user)
+            .order_by(Vacation.id)
+        )
+    return ids.scalars().all()
+
+
+async def test_export_vacations_overlapping_range(admin_client, exported_vacations):
+    _, first, second, _ = exported_vacations
+    params = {"date_from": "2035-03-03", "date_to": "2035-03-25"}
+
+    respond = await admin_client.get(base + "export/", params=params)
+    assert respond.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in respond.text.splitlines()]
+    assert [list(row) for row in rows] == [EXPORT_COLUMNS] * 2
+    assert [
+        (row["id"], row["start_date"], row["end_date"], row["receiver_email"])
+        for row in rows
+    ] == [
+        (first, "2035-03-01", "2035-03-05", "ledger@example.com"),
+        (second, "2035-03-20", "2035-04-02", "ledger@example.com"),
+    ]
+    assert {row["giver_email"] for row in rows} == {"root@example.com"}
+
+    respond = await admin_client.get(
+        base + "export/", params={**params, "after_id": first}
+    )
+    assert [json.loads(line)["id"] for line in respond.text.splitlines()] == [second]
+
+    respond = await admin_client.get(
+        base + "export/", params={**params, "format": "csv"}
+    )
+    header, *rows = csv.reader(io.StringIO(respond.text))
+    assert header == EXPORT_COLUMNS
+    assert [(int(row[0]), row[3], row[4]) for row in rows] == [
+        (first, "2035-03-01", "2035-03-05"),
+        (second, "2035-03-20", "2035-04-02"),
+    ]